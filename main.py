@@ -17,14 +17,20 @@ Requires: Outlook desktop (MAPI) and pywin32.
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
 import logging
+import mmap
 import os
 import re
 import sys
-from datetime import datetime
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 try:
     import win32com.client  # type: ignore
@@ -43,8 +49,51 @@ try:
 except ImportError:  # pragma: no cover
     md = None  # fallback: no markdown conversion
 
+try:
+    import blake3  # type: ignore
+except ImportError:  # pragma: no cover
+    blake3 = None  # optional: faster duplicate hashing
+
+from outlook_exporter.core.duplicates import (
+    DEFAULT_HASH_ALGORITHM,
+    available_algorithms,
+    hasher_factory,
+    new_hasher,
+)
 
 OUTLOOK_INBOX_ID = 6  # Default Inbox folder constant
+PR_ATTACH_DATA_BIN = "http://schemas.microsoft.com/mapi/proptag/0x37010102"
+MAX_IN_MEMORY_ATTACHMENT = 64 * 1024 * 1024  # Larger payloads go through SaveAsFile to bound memory
+WRITE_CHUNK_SIZE = 4 * 1024 * 1024  # Block size for raw attachment writes
+MMAP_HASH_THRESHOLD = 1024 * 1024  # Smaller files are hashed with hashlib.file_digest
+MAX_IN_FLIGHT_ATTACHMENTS = 32  # Cap on queued parallel attachment saves (bounds memory)
+MAX_CONSECUTIVE_ITEM_ERRORS = 10  # Stop iterating a folder after this many unreadable items in a row
+HASH_ALGORITHMS = sorted(available_algorithms())
+
+# MAPI properties fetched in a single PropertyAccessor.GetProperties round-trip per message:
+# (MsgView field, Outlook object model property used as fallback, DASL property tag)
+PR_TAG = "http://schemas.microsoft.com/mapi/proptag/"
+MSG_VIEW_PROPS = (
+    ("subject", "Subject", PR_TAG + "0x0037001F"),
+    ("sender_email", "SenderEmailAddress", PR_TAG + "0x0C1F001F"),
+    ("sender_name", "SenderName", PR_TAG + "0x0C1A001F"),
+    ("to", "To", PR_TAG + "0x0E04001F"),
+    ("cc", "CC", PR_TAG + "0x0E03001F"),
+    ("received", "ReceivedTime", PR_TAG + "0x0E060040"),
+    ("sent", "SentOn", PR_TAG + "0x00390040"),
+    ("has_attachments", None, PR_TAG + "0x0E1B000B"),
+)
+MSG_VIEW_BODY_PROP = ("body", "Body", PR_TAG + "0x1000001F")
+
+_INVALID_PATH_CHARS = '\\/:*?"<>|'  # Invalid Windows path characters
+# Single-pass RTF detagging: groups, spacing/paragraph control words, line breaks and any other control word
+_RTF_STRIP = re.compile(r'\{\\[^{}]+\}|\\s\d+|\\pard|\\par|[\r\n]|\\.[a-z0-9]+')
+# HTML bodies that are just one text-only paragraph/div carry nothing the plain Body lacks
+_TRIVIAL_HTML = re.compile(
+    r'\s*(?:<!DOCTYPE[^>]*>)?\s*<html[^>]*>\s*(?:<head>.*?</head>\s*)?<body[^>]*>\s*'
+    r'<(p|div)(?:\s[^>]*)?>[^<]{0,8192}</\1>\s*</body>\s*</html>\s*',
+    re.I | re.S,
+)
 
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -59,12 +108,13 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--without-attachments", action="store_true", help="Filter: only messages without attachments")
     parser.add_argument("--folder", type=str, help="Custom Outlook folder path (e.g. 'Inbox/SubFolder')")
     parser.add_argument("--limit", type=int, help="Max number of messages to process (pagination)")
-    parser.add_argument("--batch-size", type=int, default=200, help="Batch size for iterating messages")
+    parser.add_argument("--batch-size", type=int, default=200, help="Deprecated and ignored; messages are streamed one at a time")
+    parser.add_argument("--workers", type=int, default=4, help="Worker threads for saving attachments (1 = sequential)")
     parser.add_argument("--dry-run", action="store_true", help="Dry run: list actions without saving")
     parser.add_argument("--open-folder", action="store_true", help="Open output folder after completion")
     parser.add_argument("--log-file", type=Path, help="Path to log file")
     parser.add_argument("--duplicates-subfolder", default="duplicates", help="Name of subfolder for duplicate attachments")
-    parser.add_argument("--hash-algorithm", default="sha256", choices=hashlib.algorithms_available, help="Hash algorithm for duplicate detection")
+    parser.add_argument("--hash-algorithm", default=DEFAULT_HASH_ALGORITHM, choices=HASH_ALGORITHMS, help="Hash algorithm for duplicate detection")
     parser.add_argument("--include-inline", action="store_true", help="Include inline attachments (images in signatures). Default: skip them")
     parser.add_argument("--export-mail", action="store_true", help="Export the entire email as a .msg file")
     parser.add_argument("--export-markdown", action="store_true", help="Export the entire email as a .md (markdown) file")
@@ -98,6 +148,20 @@ def setup_logging(args: argparse.Namespace) -> None:
     )
 
 
+def dispatch_outlook():  # pragma: no cover (Outlook interaction)
+    """Return the Outlook.Application object, early-bound when the type library can be loaded.
+
+    Early-bound (makepy) proxies call properties by known DISPID instead of
+    resolving each name through IDispatch::GetIDsOfNames first.
+    """
+    try:
+        return win32com.client.gencache.EnsureDispatch("Outlook.Application")
+    except Exception as e:
+        # e.g. a stale or read-only gen_py cache
+        logging.debug("Early binding unavailable, using late-bound dispatch: %s", e)
+        return win32com.client.Dispatch("Outlook.Application")
+
+
 def get_outlook_folder(namespace, folder_path: Optional[str]):  # pragma: no cover (Outlook interaction)
     if not folder_path:
         return namespace.GetDefaultFolder(OUTLOOK_INBOX_ID)
@@ -116,50 +180,170 @@ def get_outlook_folder(namespace, folder_path: Optional[str]):  # pragma: no cov
 def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     if not date_str:
         return None
+    # fromisoformat is much cheaper than strptime for the canonical YYYY-MM-DD form;
+    # the shape check keeps other ISO forms (e.g. week dates) out of that path
+    if len(date_str) == 10 and date_str[4] == date_str[7] == '-':
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
     return datetime.strptime(date_str, "%Y-%m-%d")
 
 
-def message_matches(message, args: argparse.Namespace) -> bool:  # pragma: no cover (Outlook interaction)
+@dataclass
+class MsgView:
+    """Plain snapshot of the message properties used by filtering and export."""
+    subject: str
+    sender_email: str
+    sender_name: str
+    to: str
+    cc: str
+    received: datetime
+    sent: Optional[datetime]
+    has_attachments: bool
+    body: str = ''
+
+
+def com_datetime(value, utc: bool = False) -> Optional[datetime]:
+    """Convert a COM date to a naive local datetime.
+
+    PropertyAccessor returns true UTC values (utc=True); the object model returns
+    local wall-clock time that pywin32 labels with a UTC tzinfo.
+    """
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value
+    if utc:
+        return value.astimezone().replace(tzinfo=None)
+    return value.replace(tzinfo=None)
+
+
+def _fallback_property(message, field: str, attr: Optional[str]):
+    """Read one MsgView field through the Outlook object model."""
+    if field == 'has_attachments':
+        atts = safe_get(message, 'Attachments', [])
+        # COM collection has .Count; fallback if python list
+        if hasattr(atts, 'Count'):
+            return int(atts.Count) > 0  # type: ignore[attr-defined]
+        return len(atts) > 0
+    value = safe_get(message, attr, None)
+    if field in ('received', 'sent'):
+        return com_datetime(value)
+    return value
+
+
+def fetch_view(message, with_body: bool = True) -> MsgView:
+    """Fetch all needed message properties with one COM round-trip.
+
+    Properties the batch call cannot return (error codes in the result array, or
+    no PropertyAccessor at all) are read individually via the object model.
+    """
+    props = (*MSG_VIEW_PROPS, MSG_VIEW_BODY_PROP) if with_body else MSG_VIEW_PROPS
+    try:
+        values = message.PropertyAccessor.GetProperties([tag for _, _, tag in props])
+    except Exception as e:
+        logging.debug("GetProperties failed, reading properties individually: %s", e)
+        values = (None,) * len(props)
+
+    fields = {}
+    for (field, attr, _), raw in zip(props, values, strict=True):
+        if field in ('received', 'sent'):
+            value = com_datetime(raw, utc=True)
+        elif field == 'has_attachments':
+            value = raw if isinstance(raw, bool) else None
+        else:
+            value = raw if isinstance(raw, str) else None  # Otherwise a MAPI error code
+        if value is None:
+            value = _fallback_property(message, field, attr)
+        fields[field] = value
+
+    sender_email = fields['sender_email'] or ''
+    return MsgView(
+        subject=fields['subject'] or '',
+        sender_email=sender_email,
+        sender_name=fields['sender_name'] or sender_email,
+        to=fields['to'] or '',
+        cc=fields['cc'] or '',
+        received=fields['received'] or datetime.now(),
+        sent=fields['sent'],
+        has_attachments=bool(fields['has_attachments']),
+        body=fields.get('body') or '',
+    )
+
+
+def _dasl_time(value: datetime) -> str:
+    """Format a local datetime for a DASL comparison (DASL dates are UTC)."""
+    return value.astimezone(UTC).strftime('%Y-%m-%d %H:%M')
+
+
+def _dasl_quote(value: str) -> str:
+    """Escape a string literal for a DASL query."""
+    return value.replace("'", "''")
+
+
+def build_restriction(args: argparse.Namespace) -> Optional[str]:
+    """Build a DASL query that evaluates date, sender and attachment filters inside the MAPI store.
+
+    Expects args prepared by prepare_filters. Returns None when none of those filters are set.
+    """
+    clauses = []
+    if args._start:
+        clauses.append(f"\"urn:schemas:httpmail:datereceived\" >= '{_dasl_time(args._start)}'")
+    if args._end:
+        clauses.append(f"\"urn:schemas:httpmail:datereceived\" <= '{_dasl_time(args._end)}'")
+    if args.sender:
+        senders = " OR ".join(
+            f"\"{PR_TAG}0x0C1F001F\" = '{_dasl_quote(s)}'" for s in args.sender
+        )
+        clauses.append(f"({senders})")
+    if args.with_attachments:
+        clauses.append("\"urn:schemas:httpmail:hasattachment\" = 1")
+    if args.without_attachments:
+        clauses.append("\"urn:schemas:httpmail:hasattachment\" = 0")
+    if not clauses:
+        return None
+    return "@SQL=" + " AND ".join(clauses)
+
+
+def prepare_filters(args: argparse.Namespace) -> None:
+    """Parse dates and case-fold sender/keyword filters once per run instead of once per message."""
+    args._start = parse_date(args.start_date)
+    args._end = parse_date(args.end_date)
+    args._sender_lower = {s.lower() for s in args.sender or ()}
+    args._subj_kw_lower = tuple(kw.lower() for kw in args.subject_keyword or ())
+    args._body_kw_lower = tuple(kw.lower() for kw in args.body_keyword or ())
+
+
+def message_matches(message: MsgView, args: argparse.Namespace) -> bool:
+    """Check a message against the filters; args must have gone through prepare_filters."""
     try:
         # Date filter
-        start = parse_date(args.start_date)
-        end = parse_date(args.end_date)
-        if start or end:
-            msg_date = message.ReceivedTime  # COM datetime
-            # Convert to python datetime if needed
-            if start and msg_date < start:
-                return False
-            if end and msg_date > end:
-                return False
+        if args._start and message.received < args._start:
+            return False
+        if args._end and message.received > args._end:
+            return False
 
         # Sender filter
-        if args.sender:
-            sender_email = getattr(message, 'SenderEmailAddress', '') or ''
-            if not any(sender_email.lower() == s.lower() for s in args.sender):
-                return False
+        if args._sender_lower and message.sender_email.lower() not in args._sender_lower:
+            return False
 
         # Subject filter
-        if args.subject_keyword:
-            subject = (getattr(message, 'Subject', '') or '')
-            if not all(kw.lower() in subject.lower() for kw in args.subject_keyword):
+        if args._subj_kw_lower:
+            subject_l = message.subject.lower()
+            if not all(kw in subject_l for kw in args._subj_kw_lower):
                 return False
 
-        # Body filter
-        if args.body_keyword:
-            body = (getattr(message, 'Body', '') or '')
-            if not all(kw.lower() in body.lower() for kw in args.body_keyword):
+        # Body filter: lowercase the (potentially large) body once, not once per keyword
+        if args._body_kw_lower:
+            body_l = message.body.lower()
+            if not all(kw in body_l for kw in args._body_kw_lower):
                 return False
 
         # Attachment presence filter
-        atts = getattr(message, 'Attachments', [])
-        # COM collection has .Count; fallback if python list
-        if hasattr(atts, 'Count'):
-            has_attachments = int(atts.Count) > 0  # type: ignore[attr-defined]
-        else:
-            has_attachments = len(atts) > 0
-        if args.with_attachments and not has_attachments:
+        if args.with_attachments and not message.has_attachments:
             return False
-        if args.without_attachments and has_attachments:
+        if args.without_attachments and message.has_attachments:
             return False
 
         return True
@@ -170,8 +354,10 @@ def message_matches(message, args: argparse.Namespace) -> bool:  # pragma: no co
 
 def sanitize_for_fs(value: str, max_length: int) -> str:
     value = value.strip()
-    # Remove/replace invalid Windows path characters
-    value = re.sub(r"[\\/:*?\"<>|]", "_", value)
+    # Remove/replace invalid Windows path characters (scan + replace beats str.translate's per-char dict lookups)
+    for char in _INVALID_PATH_CHARS:
+        if char in value:
+            value = value.replace(char, '_')
     # Remove trailing spaces and dots (Windows restriction)
     value = value.rstrip('. ')
     # Truncate to max length
@@ -183,12 +369,24 @@ def sanitize_for_fs(value: str, max_length: int) -> str:
     return value
 
 
-def compute_hash(path: Path, algo: str) -> str:
-    h = hashlib.new(algo)
+# Senders repeat across many messages, so their sanitized folder names are memoized.
+# Subjects are left uncached: their unique values are unbounded.
+_sanitize_cached = functools.lru_cache(maxsize=4096)(sanitize_for_fs)
+
+
+def compute_hash(path: Path, algo: str) -> bytes:
+    """Return the raw digest of a file's contents."""
+    if algo == 'blake3':
+        h = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        h.update_mmap(path)
+        return h.digest()
     with path.open('rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            h.update(chunk)
-    return h.hexdigest()
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_HASH_THRESHOLD:
+            return hashlib.file_digest(f, hasher_factory(algo)).digest()
+        # Map the whole file so the digest runs in a single C call over the buffer
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return new_hasher(algo, mm).digest()
 
 
 def safe_get(obj, attr: str, default=None):  # pragma: no cover
@@ -200,7 +398,76 @@ def safe_get(obj, attr: str, default=None):  # pragma: no cover
         return default
 
 
-def save_attachment(base_dir: Path, message, attachment, args: argparse.Namespace, seen_hashes: dict[str, List[Path]]) -> Optional[Path]:  # pragma: no cover
+def read_attachment_bytes(attachment, size: int) -> Optional[bytes]:  # pragma: no cover
+    """Read attachment content in memory via PR_ATTACH_DATA_BIN.
+
+    ``size`` is the attachment's reported Size. Returns None when the payload is too
+    large to hold in memory or the property is unavailable (e.g. embedded items),
+    so callers can fall back to SaveAsFile.
+    """
+    if size > MAX_IN_MEMORY_ATTACHMENT:
+        return None
+    try:
+        return bytes(attachment.PropertyAccessor.GetProperty(PR_ATTACH_DATA_BIN))
+    except Exception as e:
+        logging.debug("PR_ATTACH_DATA_BIN unavailable, falling back to SaveAsFile: %s", e)
+        return None
+
+
+def write_new_file(path: Path, data: bytes) -> None:
+    """Create path (failing if it exists) and write data in large raw os.write blocks."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0))
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view[:WRITE_CHUNK_SIZE])
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+_save_lock = threading.Lock()
+_dir_cache: dict[Path, set[str]] = {}
+
+
+def unique_path(directory: Path, filename: str) -> Path:
+    """Return a free path for filename in directory, appending _1, _2, ... on collision.
+
+    Known names come from one cached listing per directory, so collisions are
+    skipped without a stat call each; the name finally chosen is still probed
+    with exists() in case the file appeared after the listing. The chosen name
+    is reserved in the cache. Callers must hold _save_lock.
+    """
+    names = _dir_cache.get(directory)
+    if names is None:
+        names = {p.name for p in directory.iterdir()} if directory.exists() else set()
+        _dir_cache[directory] = names
+    candidate = filename
+    stem, suffix = Path(filename).stem, Path(filename).suffix
+    counter = 1
+    while candidate in names or (directory / candidate).exists():
+        names.add(candidate)
+        candidate = f"{stem}_{counter}{suffix}"
+        counter += 1
+    names.add(candidate)
+    return directory / candidate
+
+
+def release_path(path: Path) -> None:
+    """Drop the reservation unique_path made for path (after a failed write). Callers must hold _save_lock."""
+    names = _dir_cache.get(path.parent)
+    if names is not None:
+        names.discard(path.name)
+
+
+def reset_path_cache() -> None:
+    """Forget all cached directory listings (once per export run: files may change in between)."""
+    with _save_lock:
+        _dir_cache.clear()
+
+
+def save_attachment(base_dir: Path, message: MsgView, attachment, args: argparse.Namespace, seen_hashes: set[bytes]) -> Optional[Tuple[Path, int]]:  # pragma: no cover
+    """Save one attachment and return its final path and size in bytes, or None if skipped."""
     # Skip inline attachments unless requested
     if not args.include_inline:
         try:
@@ -210,15 +477,9 @@ def save_attachment(base_dir: Path, message, attachment, args: argparse.Namespac
         except Exception:
             pass
 
-    subject = sanitize_for_fs(safe_get(message, 'Subject', '') or '', args.subject_sanitize_length)
-    sender = sanitize_for_fs(safe_get(message, 'SenderEmailAddress', '') or 'unknown', 120)
-    received = safe_get(message, 'ReceivedTime', datetime.now())
-    if hasattr(received, 'Format'):  # COM date
-        # Some COM objects have Format method; rely on python cast when stringifying
-        try:
-            received = datetime.strptime(str(received), '%m/%d/%y %H:%M:%S')
-        except Exception:
-            received = datetime.now()
+    subject = sanitize_for_fs(message.subject, args.subject_sanitize_length)
+    sender = _sanitize_cached(message.sender_email or 'unknown', 120)
+    received = message.received
 
     date_folder = received.strftime('%Y-%m-%d')
     target_dir = base_dir / sender / subject / date_folder
@@ -226,11 +487,11 @@ def save_attachment(base_dir: Path, message, attachment, args: argparse.Namespac
     # Check path length and truncate if needed (Windows limit ~260 chars)
     if len(str(target_dir)) > 200:  # Leave room for filename
         # Try shorter subject first
-        short_subject = sanitize_for_fs(safe_get(message, 'Subject', '') or '', 50)
+        short_subject = sanitize_for_fs(message.subject, 50)
         target_dir = base_dir / sender / short_subject / date_folder
         if len(str(target_dir)) > 200:
             # Fallback: use hash of original subject
-            subject_hash = hashlib.md5((safe_get(message, 'Subject', '') or '').encode('utf-8')).hexdigest()[:8]
+            subject_hash = hashlib.md5(message.subject.encode('utf-8'), usedforsecurity=False).hexdigest()[:8]
             target_dir = base_dir / sender / f"subj_{subject_hash}" / date_folder
     
     try:
@@ -244,86 +505,156 @@ def save_attachment(base_dir: Path, message, attachment, args: argparse.Namespac
 
     filename = sanitize_for_fs(safe_get(attachment, 'FileName', 'attachment.bin') or 'attachment.bin', 255)
     dest_path = target_dir / filename
+    reported_size = safe_get(attachment, 'Size', 0) or 0
 
     if args.dry_run:
         logging.info("[DRY-RUN] Would save attachment: %s", dest_path)
-        return dest_path
+        return dest_path, reported_size
+
+    # Hash the in-memory payload so the file is written exactly once; very large
+    # or non-file attachments fall back to a temp file written by Outlook.
+    data = read_attachment_bytes(attachment, reported_size)
+    temp_path: Optional[Path] = None
+    if data is not None:
+        file_hash = new_hasher(args.hash_algorithm, data).digest()
+        size = len(data)
+    else:
+        # Reserve the temp name: another worker may be saving a same-named attachment here
+        with _save_lock:
+            temp_path = unique_path(target_dir, filename + '.tmp')
+        try:
+            attachment.SaveAsFile(str(temp_path))
+        except Exception as e:
+            logging.warning("Failed to save attachment temp file %s: %s", temp_path, e)
+            temp_path.unlink(missing_ok=True)
+            return None
+        file_hash = compute_hash(temp_path, args.hash_algorithm)
+        size = temp_path.stat().st_size
+
+    # Duplicate check, name reservation and registration must be atomic across worker threads
+    with _save_lock:
+        duplicate = file_hash in seen_hashes
+
+        if duplicate:
+            duplicates_dir = target_dir / args.duplicates_subfolder
+            duplicates_dir.mkdir(parents=True, exist_ok=True)
+            final_path = unique_path(duplicates_dir, filename)
+        else:
+            final_path = unique_path(target_dir, filename)
+            seen_hashes.add(file_hash)
+
+    # The name is reserved, so the write itself can run outside the lock
+    while True:
+        try:
+            if temp_path is not None:
+                if final_path.exists():
+                    raise FileExistsError(final_path)
+                temp_path.rename(final_path)
+            else:
+                write_new_file(final_path, data)
+            break
+        except FileExistsError:
+            # Created by someone else since it was reserved: take the next free name
+            with _save_lock:
+                final_path = unique_path(final_path.parent, filename)
+        except OSError as e:
+            logging.warning("Failed to write attachment %s: %s", final_path, e)
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+            with _save_lock:
+                release_path(final_path)
+                if not duplicate:
+                    seen_hashes.discard(file_hash)
+            return None
+
+    if duplicate:
+        logging.info("Duplicate detected (hash=%s). Saved to %s", file_hash.hex(), final_path)
+    elif logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Saved attachment %s (hash=%s)", final_path, file_hash.hex())
+    return final_path, size
+
+
+def _save_marshalled_attachment(stream, base_dir: Path, view: MsgView, args: argparse.Namespace, seen_hashes: set[bytes]) -> Optional[Tuple[Path, int]]:  # pragma: no cover
+    """Worker-thread entry point: unmarshal the attachment into this thread's apartment, then save it."""
+    pythoncom.CoInitialize()
+    try:
+        attachment = win32com.client.Dispatch(pythoncom.CoGetInterfaceAndReleaseStream(stream, pythoncom.IID_IDispatch))
+        try:
+            return save_attachment(base_dir, view, attachment, args, seen_hashes)
+        finally:
+            del attachment  # Release the proxy before leaving the apartment
+    finally:
+        pythoncom.CoUninitialize()
+
 
-    # Write to a temp file first to compute hash reliably
-    temp_path = dest_path.with_suffix(dest_path.suffix + '.tmp')
+def attachment_count(attachments) -> int:
+    """Return the number of entries in a COM Attachments collection or plain sequence."""
+    if isinstance(attachments, (list, tuple)):
+        return len(attachments)
     try:
-        attachment.SaveAsFile(str(temp_path))
+        return int(attachments.Count)
     except Exception as e:
-        logging.warning("Failed to save attachment temp file %s: %s", temp_path, e)
-        return None
+        logging.debug("Could not read attachment count: %s", e)
+        return 0
 
-    file_hash = compute_hash(temp_path, args.hash_algorithm)
-    duplicate = file_hash in seen_hashes
 
-    if duplicate:
-        duplicates_dir = target_dir / args.duplicates_subfolder
-        duplicates_dir.mkdir(parents=True, exist_ok=True)
-        dup_dest = duplicates_dir / filename
-        # Rename if already exists
-        counter = 1
-        while dup_dest.exists():
-            dup_dest = duplicates_dir / f"{dup_dest.stem}_{counter}{dup_dest.suffix}"
-            counter += 1
-        temp_path.rename(dup_dest)
-        logging.info("Duplicate detected (hash=%s). Saved to %s", file_hash, dup_dest)
-        seen_hashes[file_hash].append(dup_dest)
-        return dup_dest
-    else:
-        # Rename if existing
-        final_path = dest_path
-        counter = 1
-        while final_path.exists():
-            final_path = dest_path.with_name(f"{dest_path.stem}_{counter}{dest_path.suffix}")
-            counter += 1
-        temp_path.rename(final_path)
-        logging.debug("Saved attachment %s (hash=%s)", final_path, file_hash)
-        seen_hashes[file_hash] = [final_path]
-        return final_path
-
-
-def iterate_messages(folder, limit: Optional[int], batch_size: int) -> Iterable:  # pragma: no cover
-    items = folder.Items
-    total = items.Count
+def iter_attachments(attachments, count: Optional[int] = None) -> Iterable:
+    """Yield attachments, using 1-based Item() access for COM collections.
+
+    The collection shape is resolved once up front instead of re-probing
+    ``Item``/``Count`` for every index.
+    """
+    if isinstance(attachments, (list, tuple)):
+        yield from attachments
+        return
+    if count is None:
+        count = attachment_count(attachments)
+    if not count:
+        return
+    item = attachments.Item
+    for idx in range(1, count + 1):
+        try:
+            yield item(idx)
+        except Exception as e:
+            logging.debug("Error accessing attachment %d/%d: %s", idx, count, e)
+
+
+def iterate_messages(items, limit: Optional[int]) -> Iterable:
+    """Yield up to limit messages from an Items collection, in its sort order.
+
+    Walks the collection with the GetFirst/GetNext cursor: Item(i) makes Outlook
+    seek to index i on every call, which is quadratic over a large folder.
+    """
+    if not hasattr(items, 'GetFirst'):
+        # Plain Python sequence
+        yield from (items[:limit] if limit else items)
+        return
     processed = 0
-    
-    # Use COM safe iteration with Item() method and error handling
-    while processed < total:
+    errors = 0
+    message = items.GetFirst()
+    while message is not None:
+        yield message
+        processed += 1
         if limit and processed >= limit:
             break
-        end_index = min(processed + batch_size, total)
-        for i in range(processed + 1, end_index + 1):
+        message = None
+        # Skip unreadable items; give up only when the cursor keeps failing
+        while errors < MAX_CONSECUTIVE_ITEM_ERRORS:
             try:
-                # Use Item method for 1-based COM access
-                if hasattr(items, 'Item'):
-                    yield items.Item(i)  # type: ignore[attr-defined]
-                else:
-                    # Fallback to direct indexing
-                    yield items[i]
-            except (IndexError, Exception) as e:
-                logging.debug("Failed to access message %d/%d: %s", i, total, e)
-                # Skip this message and continue
-                continue
-        processed = end_index
+                message = items.GetNext()
+                errors = 0
+                break
+            except Exception as e:
+                errors += 1
+                logging.debug("Failed to access message after %d: %s", processed, e)
+        else:
+            logging.warning("Stopped after %d consecutive unreadable messages", errors)
 
 
-def save_mail(base_dir: Path, message, args: argparse.Namespace) -> Optional[Path]:
-    subject = sanitize_for_fs(
-        safe_get(message, "Subject", "") or "", args.subject_sanitize_length
-    )
-    sender = sanitize_for_fs(
-        safe_get(message, "SenderEmailAddress", "") or "unknown", 120
-    )
-    received = safe_get(message, "ReceivedTime", datetime.now())
-    if hasattr(received, "Format"):  # COM date
-        try:
-            received = datetime.strptime(str(received), "%m/%d/%y %H:%M:%S")
-        except Exception:
-            received = datetime.now()
+def save_mail(base_dir: Path, message, view: MsgView, args: argparse.Namespace) -> Optional[Path]:
+    subject = sanitize_for_fs(view.subject, args.subject_sanitize_length)
+    sender = _sanitize_cached(view.sender_email or "unknown", 120)
+    received = view.received
 
     date_folder = received.strftime("%Y-%m-%d")
     target_dir = base_dir / sender / subject / date_folder
@@ -352,40 +683,31 @@ def format_size(size_bytes: int) -> str:
         size_bytes /= 1024.0
     return f"{size_bytes:.1f} TB"
 
-def save_markdown(base_dir: Path, message, args: argparse.Namespace, saved_attachments: List[Path]) -> Optional[Path]:  # pragma: no cover
+def is_trivial_html(html_body: str) -> bool:
+    """Return True if html_body is a bare document wrapping a single text-only <p> or <div>."""
+    return _TRIVIAL_HTML.fullmatch(html_body) is not None
+
+
+def save_markdown(base_dir: Path, message, view: MsgView, args: argparse.Namespace, saved_attachments: List[Tuple[Path, int]]) -> Optional[Path]:  # pragma: no cover
     """Save email as markdown file with YAML frontmatter."""
     if md is None:
         logging.warning("markdownify not available. Install with 'pip install markdownify'")
         return None
     
     # Extract email metadata
-    subject_raw = safe_get(message, "Subject", "") or "No Subject"
+    subject_raw = view.subject or "No Subject"
     subject = sanitize_for_fs(subject_raw, args.subject_sanitize_length)
-    sender_email = safe_get(message, "SenderEmailAddress", "") or "unknown"
-    sender_name = safe_get(message, "SenderName", "") or sender_email
-    sender = sanitize_for_fs(sender_email, 120)
+    sender_email = view.sender_email or "unknown"
+    sender_name = view.sender_name or sender_email
+    sender = _sanitize_cached(sender_email, 120)
     
     # Recipients
-    to_recipients = safe_get(message, "To", "") or ""
-    cc_recipients = safe_get(message, "CC", "") or ""
+    to_recipients = view.to
+    cc_recipients = view.cc
     
     # Dates
-    received = safe_get(message, "ReceivedTime", datetime.now())
-    sent = safe_get(message, "SentOn", None)
-    
-    if hasattr(received, "Format"):  # COM date
-        try:
-            received = datetime.strptime(str(received), "%m/%d/%y %H:%M:%S")
-        except Exception:
-            received = datetime.now()
-    
-    if sent and hasattr(sent, "Format"):
-        try:
-            sent = datetime.strptime(str(sent), "%m/%d/%y %H:%M:%S")
-        except Exception:
-            sent = received
-    else:
-        sent = received
+    received = view.received
+    sent = view.sent or received
     
     # Create target directory
     date_folder = received.strftime("%Y-%m-%d")
@@ -401,7 +723,7 @@ def save_markdown(base_dir: Path, message, args: argparse.Namespace, saved_attac
     
     # Get email body
     html_body = safe_get(message, "HTMLBody", "")
-    plain_body = safe_get(message, "Body", "")
+    plain_body = view.body
     rtf_body = None
     
     if not html_body and not plain_body:
@@ -413,13 +735,14 @@ def save_markdown(base_dir: Path, message, args: argparse.Namespace, saved_attac
                 # For a more robust solution, a dedicated RTF-to-text library would be better
                 rtf_body = rtf_body_bytes.decode('ascii', errors='ignore')
                 # Basic parsing to remove RTF control words
-                rtf_body = re.sub(r'{\\[^{}]+}|\\s\d+|\\pard|\\par|\n|\r', '', rtf_body)
-                rtf_body = re.sub(r'\\.[a-z0-9]+', '', rtf_body).strip()
+                rtf_body = _RTF_STRIP.sub('', rtf_body).strip()
         except Exception as e:
             logging.warning("Could not process RTFBody: %s", e)
 
-    # Convert body to markdown
-    if html_body:
+    # Convert body to markdown; skip the HTML parser when the plain body says the same thing
+    if html_body and plain_body and is_trivial_html(html_body):
+        body_markdown = plain_body
+    elif html_body:
         try:
             body_markdown = md(html_body, heading_style="ATX", bullets="-")
         except Exception as e:
@@ -436,60 +759,49 @@ def save_markdown(base_dir: Path, message, args: argparse.Namespace, saved_attac
             subject_raw
         )
     
-    # Build markdown content
-    markdown_lines = []
-    
-    # YAML frontmatter
-    markdown_lines.append("---")
-    markdown_lines.append(f"from: {sender_email}")
-    if to_recipients:
-        markdown_lines.append(f"to: {to_recipients}")
-    if cc_recipients:
-        markdown_lines.append(f"cc: {cc_recipients}")
-    markdown_lines.append(f"subject: {subject_raw}")
-    markdown_lines.append(f"date: {sent.isoformat()}")
-    markdown_lines.append(f"received: {received.isoformat()}")
-    markdown_lines.append("---")
-    markdown_lines.append("")
-    
-    # Email header section
-    markdown_lines.append(f"# {subject_raw}")
-    markdown_lines.append("")
-    markdown_lines.append(f"**From:** {sender_name} ({sender_email})  ")
-    if to_recipients:
-        markdown_lines.append(f"**To:** {to_recipients}  ")
-    if cc_recipients:
-        markdown_lines.append(f"**CC:** {cc_recipients}  ")
-    markdown_lines.append(f"**Date:** {sent.strftime('%B %d, %Y %I:%M %p')}")
-    markdown_lines.append("")
-    markdown_lines.append("---")
-    markdown_lines.append("")
-    
-    # Email body
-    markdown_lines.append(body_markdown)
-    markdown_lines.append("")
-    
-    # Attachments section
-    if saved_attachments:
-        markdown_lines.append("---")
-        markdown_lines.append("")
-        markdown_lines.append("## Attachments")
-        markdown_lines.append("")
-        for attachment_path in saved_attachments:
-            try:
-                size = attachment_path.stat().st_size
-                size_str = format_size(size)
-                # Get relative path from markdown file to attachment
-                rel_path = os.path.relpath(attachment_path, dest_path.parent)
-                markdown_lines.append(f"- [{attachment_path.name}]({rel_path}) ({size_str})")
-            except Exception as e:
-                logging.debug("Failed to get attachment info for %s: %s", attachment_path, e)
-                markdown_lines.append(f"- {attachment_path.name}")
-    
-    # Write markdown file
+    # Stream the document straight into a large-buffered file instead of
+    # building a list and joining it (which copies the whole body again)
     try:
-        with dest_path.open('w', encoding='utf-8') as f:
-            f.write('\n'.join(markdown_lines))
+        with dest_path.open('w', encoding='utf-8', buffering=1 << 20) as f:
+            w = f.write
+            # YAML frontmatter
+            w("---\n")
+            w(f"from: {sender_email}\n")
+            if to_recipients:
+                w(f"to: {to_recipients}\n")
+            if cc_recipients:
+                w(f"cc: {cc_recipients}\n")
+            w(f"subject: {subject_raw}\n")
+            w(f"date: {sent.isoformat()}\n")
+            w(f"received: {received.isoformat()}\n")
+            w("---\n\n")
+
+            # Email header section
+            w(f"# {subject_raw}\n\n")
+            w(f"**From:** {sender_name} ({sender_email})  \n")
+            if to_recipients:
+                w(f"**To:** {to_recipients}  \n")
+            if cc_recipients:
+                w(f"**CC:** {cc_recipients}  \n")
+            w(f"**Date:** {sent.strftime('%B %d, %Y %I:%M %p')}\n\n")
+            w("---\n\n")
+
+            # Email body
+            w(body_markdown)
+            w("\n")
+
+            # Attachments section
+            if saved_attachments:
+                w("\n---\n\n## Attachments\n")
+                for attachment_path, size in saved_attachments:
+                    try:
+                        size_str = format_size(size)
+                        # Get relative path from markdown file to attachment
+                        rel_path = os.path.relpath(attachment_path, dest_path.parent)
+                        w(f"\n- [{attachment_path.name}]({rel_path}) ({size_str})")
+                    except Exception as e:
+                        logging.debug("Failed to get attachment info for %s: %s", attachment_path, e)
+                        w(f"\n- {attachment_path.name}")
         logging.info("Saved markdown: %s", dest_path)
         return dest_path
     except Exception as e:
@@ -498,90 +810,91 @@ def save_markdown(base_dir: Path, message, args: argparse.Namespace, saved_attac
 
 
 def process_messages(args: argparse.Namespace) -> int:  # pragma: no cover
-    outlook = win32com.client.Dispatch("Outlook.Application").GetNamespace("MAPI")
+    outlook = dispatch_outlook().GetNamespace("MAPI")
     folder = get_outlook_folder(outlook, args.folder)
     base_dir: Path = args.output
     base_dir.mkdir(parents=True, exist_ok=True)
+    reset_path_cache()
 
-    seen_hashes: dict[str, List[Path]] = {}
+    seen_hashes: set[bytes] = set()
     saved_count = 0
     matched_messages = 0
 
-    messages_iter = iterate_messages(folder, args.limit, args.batch_size)
+    # Attachment saves overlap on worker threads; each task joins (and leaves) a COM apartment
+    pool = None
+    if args.workers > 1 and not args.dry_run:
+        pool = ThreadPoolExecutor(max_workers=args.workers)
+    in_flight: deque[Future] = deque()
+
+    def drain(keep: int) -> None:
+        nonlocal saved_count
+        while len(in_flight) > keep:
+            if in_flight.popleft().result():
+                saved_count += 1
+
+    def submit_attachment(view: MsgView, attachment) -> Future:
+        drain(MAX_IN_FLIGHT_ATTACHMENTS - 1)
+        if pool is None:
+            future: Future = Future()
+            future.set_result(save_attachment(base_dir, view, attachment, args, seen_hashes))
+        else:
+            stream = pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, attachment._oleobj_)
+            future = pool.submit(_save_marshalled_attachment, stream, base_dir, view, args, seen_hashes)
+        in_flight.append(future)
+        return future
+
+    items = folder.Items
+    query = build_restriction(args)
+    if query:
+        # Let the store discard non-matching rows; message_matches re-checks as a guard
+        logging.debug("Restricting folder items: %s", query)
+        items = items.Restrict(query)
+    items.Sort("[ReceivedTime]", True)
+    items.IncludeRecurrences = False
+
+    messages_iter = iterate_messages(items, args.limit)
     wrapper = tqdm(messages_iter, desc="Messages", unit="msg") if (tqdm and not args.quiet) else messages_iter
-    for message in wrapper:
-        if message_matches(message, args):
-            matched_messages += 1
-            if args.export_mail:
-                path = save_mail(base_dir, message, args)
-                if path:
-                    saved_count += 1
-                continue
-            if args.export_markdown:
-                # Save attachments first, then create markdown with references
-                saved_attachments: List[Path] = []
-                attachments = getattr(message, "Attachments", [])
-                if hasattr(attachments, "Count"):
-                    attach_count = int(attachments.Count)  # type: ignore[attr-defined]
-                else:
-                    attach_count = len(attachments)
-                
-                # Save all attachments
-                for idx in range(1, attach_count + 1):
-                    try:
-                        if hasattr(attachments, "Item"):
-                            attachment = attachments.Item(idx)  # type: ignore[attr-defined]
-                        else:
-                            attachment = attachments[idx - 1]
-                    except (IndexError, Exception) as e:
-                        logging.debug("Error accessing attachment %d: %s", idx, e)
-                        continue
-                    
-                    path = save_attachment(base_dir, message, attachment, args, seen_hashes)
+    with_body = bool(args.body_keyword) or args.export_markdown
+    try:
+        for message in wrapper:
+            view = fetch_view(message, with_body=with_body)
+            if message_matches(view, args):
+                matched_messages += 1
+                if args.export_mail:
+                    path = save_mail(base_dir, message, view, args)
                     if path:
-                        saved_attachments.append(path)
                         saved_count += 1
+                    continue
+                if args.export_markdown:
+                    # Save attachments first, then create markdown with references
+                    saved_attachments: List[Tuple[Path, int]] = []
+                    futures: List[Future] = []
+
+                    # Save all attachments
+                    for attachment in iter_attachments(getattr(message, "Attachments", ())):
+                        futures.append(submit_attachment(view, attachment))
+                    saved_attachments.extend(saved for saved in (f.result() for f in futures) if saved)
                 
-                # Save markdown with attachment references
-                path = save_markdown(base_dir, message, args, saved_attachments)
-                if path:
-                    saved_count += 1
-                continue
+                    # Save markdown with attachment references
+                    path = save_markdown(base_dir, message, view, args, saved_attachments)
+                    if path:
+                        saved_count += 1
+                    continue
             
-            # Default: just save attachments
-            attachments = getattr(message, "Attachments", [])
-            if hasattr(attachments, "Count"):
-                attach_count = int(attachments.Count)  # type: ignore[attr-defined]
+                # Default: just save attachments
+                # message_matches already enforced --with/--without-attachments; only touch the
+                # Attachments collection when there can be something to save (PR_HASATTACH
+                # ignores hidden inline images, so --include-inline always enumerates)
+                if args.without_attachments or not (view.has_attachments or args.include_inline):
+                    continue
+                for attachment in iter_attachments(getattr(message, "Attachments", ())):
+                    submit_attachment(view, attachment)
             else:
-                attach_count = len(attachments)
-            if attach_count == 0 and args.with_attachments:
                 continue
-            if attach_count > 0 and args.without_attachments:
-                continue
-            # Iterate attachments safely (COM collections are 1-based via Item())
-            for idx in range(1, attach_count + 1):
-                try:
-                    # Use Item method if available to avoid IndexError from python enumerator
-                    if hasattr(attachments, "Item"):
-                        attachment = attachments.Item(idx)  # type: ignore[attr-defined]
-                    else:
-                        # Fallback: python sequence (0-based)
-                        attachment = attachments[idx - 1]
-                except IndexError:
-                    logging.debug(
-                        "IndexError accessing attachment %d/%d", idx, attach_count
-                    )
-                    continue
-                except Exception as e:
-                    logging.debug("Error accessing attachment %d: %s", idx, e)
-                    continue
-                path = save_attachment(
-                    base_dir, message, attachment, args, seen_hashes
-                )
-                if path:
-                    saved_count += 1
-        else:
-            continue
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    drain(0)
     logging.info("Messages matched filters: %d", matched_messages)
     logging.info("Attachments saved: %d", saved_count)
     return saved_count
@@ -597,6 +910,7 @@ def run_export(args: argparse.Namespace) -> int:
     if args.export_mail and args.export_markdown:
         logging.error("Cannot specify both --export-mail and --export-markdown")
         return 2
+    prepare_filters(args)
     pythoncom.CoInitialize()
     try:
         saved = process_messages(args)
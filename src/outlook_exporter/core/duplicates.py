@@ -4,107 +4,339 @@ This module provides functionality for detecting duplicate files based on
 their content hash, allowing intelligent handling of duplicate attachments.
 """
 
+import functools
 import hashlib
+import json
 import logging
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 from outlook_exporter.utils.exceptions import DuplicateDetectionError
 
+try:
+    import blake3
+except ImportError:  # pragma: no cover
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# Bytes compared per step when verifying duplicate sets (allows early exit)
+VERIFY_CHUNK_SIZE = 1 << 20
+
+# File name of the persisted hash registry, kept in the export output directory
+CACHE_FILENAME = ".duplicate_cache.json"
+
+# Files below this size (most signature images, icons and office documents) are
+# read and hashed in one-shot calls; mmap setup costs more than it saves
+MMAP_THRESHOLD = 1 << 20
+
+# Duplicate detection hash used by both the CLI and the package exporters
+DEFAULT_HASH_ALGORITHM = "blake2b"
+
+# BLAKE2b digests are truncated to 128 bits, ample to tell attachments apart
+BLAKE2B_DIGEST_SIZE = 16
+
+def available_algorithms() -> set:
+    """Return the hash algorithm names DuplicateTracker accepts."""
+    if blake3 is None:
+        return set(hashlib.algorithms_available)
+    return set(hashlib.algorithms_available) | {"blake3"}
+
+
+def _locations(entry: Union[Path, Tuple[Path, ...]]) -> Tuple[Path, ...]:
+    """Return the paths stored for one digest as a tuple."""
+    return (entry,) if isinstance(entry, Path) else entry
+
+
+def _mapped_equal(reference: mmap.mmap, other_path: Path) -> bool:
+    """Compare a mapped reference file against another file of the same size."""
+    with other_path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as other:
+        # Slicing an mmap yields bytes, whose equality is a single memcmp
+        for start in range(0, len(reference), VERIFY_CHUNK_SIZE):
+            end = start + VERIFY_CHUNK_SIZE
+            if reference[start:end] != other[start:end]:
+                return False
+    return True
+
+
+def _new_blake3(data=b""):
+    """Create a BLAKE3 hasher that spreads large inputs across threads."""
+    return blake3.blake3(data, max_threads=blake3.blake3.AUTO)
+
+
+def hasher_factory(hash_algorithm: str) -> Callable:
+    """Return the constructor of hash objects for a duplicate detection algorithm.
+    
+    BLAKE2b is truncated to BLAKE2B_DIGEST_SIZE bytes, so every caller produces
+    the same digests for the same content. The constructor is resolved once,
+    which skips the by-name lookup in hashlib.new on every hash.
+    
+    Args:
+        hash_algorithm: Any hashlib algorithm, or 'blake3' when the blake3
+            package is installed
+        
+    Returns:
+        A callable taking optional initial data and returning a hash object
+    """
+    if hash_algorithm == "blake3":
+        return _new_blake3
+    if hash_algorithm == "blake2b":
+        return functools.partial(hashlib.blake2b, digest_size=BLAKE2B_DIGEST_SIZE)
+    if hash_algorithm in hashlib.algorithms_guaranteed:
+        return getattr(hashlib, hash_algorithm)
+    return functools.partial(hashlib.new, hash_algorithm)
+
+
+def new_hasher(hash_algorithm: str, data=b""):
+    """Create a hash object for duplicate detection (see hasher_factory)."""
+    return hasher_factory(hash_algorithm)(data)
+
+
 class DuplicateTracker:
     """Tracks file hashes to detect duplicate attachments.
     
     Uses content-based hashing to identify duplicate files, regardless of
     their filename or location. Maintains a registry of all seen files.
+    Hashing is safe to run from several threads; registry updates are
+    serialized by an internal lock.
     
     Attributes:
-        hash_algorithm: The hash algorithm to use (e.g., 'sha256', 'md5')
-        seen_hashes: Dictionary mapping hash values to lists of file paths
+        hash_algorithm: The hash algorithm to use (e.g., 'sha256', 'blake3')
+        seen_hashes: Dictionary mapping raw digests to the saved path, or to a
+            tuple of paths once the content has been seen more than once
     """
     
-    def __init__(self, hash_algorithm: str = "sha256"):
+    def __init__(self, hash_algorithm: str = DEFAULT_HASH_ALGORITHM):
         """Initialize the duplicate tracker.
         
         Args:
-            hash_algorithm: Hash algorithm to use for duplicate detection
+            hash_algorithm: Hash algorithm to use for duplicate detection.
+                Any hashlib algorithm, or 'blake3' when the blake3 package is installed.
             
         Raises:
             DuplicateDetectionError: If the hash algorithm is not available
         """
-        if hash_algorithm not in hashlib.algorithms_available:
+        available = available_algorithms()
+        if hash_algorithm not in available:
             raise DuplicateDetectionError(
                 f"Hash algorithm '{hash_algorithm}' is not available. "
-                f"Available algorithms: {', '.join(sorted(hashlib.algorithms_available))}"
+                f"Available algorithms: {', '.join(sorted(available))}"
             )
         
         self.hash_algorithm = hash_algorithm
-        self.seen_hashes: Dict[str, List[Path]] = {}
+        # Duplicates are rare, so a digest maps straight to its Path and is only
+        # promoted to a tuple on the second registration
+        self.seen_hashes: Dict[bytes, Union[Path, Tuple[Path, ...]]] = {}
+        # Running count of registered paths, so statistics are O(1) to report
+        self._total_files = 0
+        self._lock = threading.Lock()
+        self._hasher_factory = hasher_factory(hash_algorithm)
+        self._digest_size = self._hasher_factory().digest_size
     
-    def compute_file_hash(self, file_path: Path) -> str:
-        """Compute the hash of a file's contents.
+    def compute_file_digest(self, file_path: Path) -> bytes:
+        """Compute the raw digest of a file's contents.
         
-        Reads the file in chunks to handle large files efficiently.
+        Small files are read in a single call. Larger files are memory-mapped so
+        the digest runs over the whole mapping in one update (BLAKE3 also
+        spreads it across threads); files that cannot be mapped are streamed
+        through hashlib.file_digest, which runs the read/update loop in C.
         
         Args:
             file_path: Path to the file to hash
             
         Returns:
-            Hexadecimal string representation of the file's hash
+            The raw digest bytes
             
         Raises:
             DuplicateDetectionError: If the file cannot be read or hashed
         """
         try:
-            hasher = hashlib.new(self.hash_algorithm)
-            
-            with file_path.open('rb') as f:
-                # Read in 8KB chunks to handle large files
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hasher.update(chunk)
-            
-            return hasher.hexdigest()
+            with file_path.open('rb', buffering=0) as f:
+                if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+                    return self._hasher_factory(f.read()).digest()
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return self._hasher_factory(mm).digest()
+                except (ValueError, OSError):
+                    # Some file systems (e.g. network shares) refuse mappings
+                    f.seek(0)
+                    return hashlib.file_digest(f, self._hasher_factory).digest()
         
         except (IOError, OSError) as e:
             raise DuplicateDetectionError(
                 f"Failed to compute hash for {file_path}: {e}"
             ) from e
     
-    def is_duplicate(self, file_hash: str) -> bool:
+    def compute_file_digests(
+        self,
+        file_paths: Iterable[Path],
+        max_workers: Optional[int] = None,
+    ) -> Dict[Path, bytes]:
+        """Compute the raw digests of several files at once.
+        
+        Files are hashed on parallel threads (hashlib and BLAKE3 release the GIL
+        while hashing), so several hash streams are in flight at the same time
+        during bulk scans. A single file is hashed on the calling thread.
+        
+        Args:
+            file_paths: Paths of the files to hash
+            max_workers: Maximum number of hashing threads (defaults to the CPU count)
+            
+        Returns:
+            Dictionary mapping each path to its raw digest
+            
+        Raises:
+            DuplicateDetectionError: If any file cannot be read or hashed
+        """
+        paths = list(file_paths)
+        if len(paths) < 2:
+            return {path: self.compute_file_digest(path) for path in paths}
+        
+        workers = min(len(paths), max_workers or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-hash") as pool:
+            return dict(zip(paths, pool.map(self.compute_file_digest, paths), strict=True))
+    
+    def compute_file_hash_hex(self, file_path: Path) -> str:
+        """Compute a file's digest as a hexadecimal string, for display and logging.
+        
+        Args:
+            file_path: Path to the file to hash
+            
+        Returns:
+            Hexadecimal string representation of the file's hash
+        """
+        return self.compute_file_digest(file_path).hex()
+    
+    def compute_data_digest(self, data: bytes) -> bytes:
+        """Compute the raw digest of in-memory content.
+        
+        Used when attachment bytes are already in memory, so the content does
+        not have to be written to disk and read back just to be hashed.
+        
+        Args:
+            data: The content to hash
+            
+        Returns:
+            The raw digest bytes
+        """
+        return self._hasher_factory(data).digest()
+    
+    def is_duplicate(self, file_hash: bytes) -> bool:
         """Check if a file hash has been seen before.
         
         Args:
-            file_hash: The hash to check
+            file_hash: The raw digest to check
             
         Returns:
             True if this hash has been seen before, False otherwise
         """
         return file_hash in self.seen_hashes
     
-    def register_file(self, file_path: Path, file_hash: str) -> None:
+    def register_file(self, file_path: Path, file_hash: bytes) -> None:
         """Register a file in the duplicate tracker.
         
         Args:
             file_path: Path where the file was saved
-            file_hash: Hash of the file's contents
+            file_hash: Raw digest of the file's contents
+        """
+        with self._lock:
+            self._insert(file_hash, file_path)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Registered file {file_path.name} with hash {file_hash[:4].hex()}...")
+    
+    def bulk_register(self, file_paths: Iterable[Path], max_inflight: int = 64) -> int:
+        """Hash and register many existing files, e.g. to rebuild state after a restart.
+        
+        Up to ``max_inflight`` files are hashed concurrently. Files that cannot
+        be read are logged and skipped. Files are registered in input order,
+        so the first path seen for a digest is treated as the original.
+        
+        Args:
+            file_paths: Paths of previously exported files
+            max_inflight: Maximum number of files hashed at the same time
+            
+        Returns:
+            Number of files registered
         """
-        if file_hash not in self.seen_hashes:
-            self.seen_hashes[file_hash] = []
+        paths = list(file_paths)
+        if not paths:
+            return 0
         
-        self.seen_hashes[file_hash].append(file_path)
-        logger.debug(f"Registered file {file_path.name} with hash {file_hash[:8]}...")
+        def digest_or_none(path: Path) -> Optional[bytes]:
+            try:
+                return self.compute_file_digest(path)
+            except DuplicateDetectionError as e:
+                logger.warning(f"Skipping {path}: {e}")
+                return None
+        
+        workers = min(len(paths), max_inflight, 4 * (os.cpu_count() or 1))
+        registered = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="file-hash") as pool:
+            for path, digest in zip(paths, pool.map(digest_or_none, paths), strict=True):
+                if digest is not None:
+                    self.register_file(path, digest)
+                    registered += 1
+        return registered
+    
+    def _insert(self, file_hash: bytes, file_path: Path) -> None:
+        """Add a path to the registry (caller holds the lock or owns the tracker)."""
+        entry = self.seen_hashes.get(file_hash)
+        if entry is None:
+            self.seen_hashes[file_hash] = file_path
+        elif isinstance(entry, Path):
+            self.seen_hashes[file_hash] = (entry, file_path)
+        else:
+            self.seen_hashes[file_hash] = (*entry, file_path)
+        self._total_files += 1
     
-    def get_original_locations(self, file_hash: str) -> List[Path]:
+    def verify_set(self, file_paths: List[Path]) -> bool:
+        """Confirm byte-for-byte that a set of same-hash files really are identical.
+        
+        Rules out hash collisions before acting on a duplicate set. Sizes are
+        compared first; contents are then compared over memory maps in 1 MiB
+        steps (one memcmp per step), stopping at the first difference.
+        
+        Args:
+            file_paths: Files that share a digest
+            
+        Returns:
+            True if every file has exactly the same content as the first
+            
+        Raises:
+            DuplicateDetectionError: If a file cannot be read
+        """
+        if len(file_paths) < 2:
+            return True
+        try:
+            sizes = {path.stat().st_size for path in file_paths}
+            if len(sizes) != 1:
+                return False
+            if sizes.pop() == 0:
+                return True
+            first, *others = file_paths
+            with first.open('rb') as f_ref, mmap.mmap(f_ref.fileno(), 0, access=mmap.ACCESS_READ) as reference:
+                for other in others:
+                    if not _mapped_equal(reference, other):
+                        return False
+        except (IOError, OSError, ValueError) as e:
+            raise DuplicateDetectionError(f"Failed to verify duplicate set: {e}") from e
+        return True
+    
+    def get_original_locations(self, file_hash: bytes) -> List[Path]:
         """Get all locations where this hash has been saved.
         
         Args:
-            file_hash: The hash to look up
+            file_hash: The raw digest to look up
             
         Returns:
             List of paths where files with this hash have been saved
         """
-        return self.seen_hashes.get(file_hash, [])
+        entry = self.seen_hashes.get(file_hash)
+        return [] if entry is None else list(_locations(entry))
     
     def get_statistics(self) -> Dict[str, int]:
         """Get statistics about duplicate detection.
@@ -116,7 +348,7 @@ class DuplicateTracker:
                 - duplicate_files: Number of duplicate files detected
         """
         unique_files = len(self.seen_hashes)
-        total_files = sum(len(paths) for paths in self.seen_hashes.values())
+        total_files = self._total_files
         duplicate_files = total_files - unique_files
         
         return {
@@ -125,7 +357,85 @@ class DuplicateTracker:
             "duplicate_files": duplicate_files
         }
     
+    def save(self, cache_path: Path) -> None:
+        """Persist the registry so a later run can skip re-hashing known files.
+        
+        Args:
+            cache_path: JSON file to write
+            
+        Raises:
+            DuplicateDetectionError: If the cache cannot be written
+        """
+        with self._lock:
+            payload = {
+                "hash_algorithm": self.hash_algorithm,
+                "digest_size": self._digest_size,
+                "hashes": {
+                    digest.hex(): [str(path) for path in _locations(entry)]
+                    for digest, entry in self.seen_hashes.items()
+                },
+            }
+        try:
+            tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            raise DuplicateDetectionError(f"Failed to save duplicate cache {cache_path}: {e}") from e
+        logger.debug(f"Saved {len(payload['hashes'])} hashes to {cache_path}")
+    
+    @classmethod
+    def load(cls, cache_path: Path, hash_algorithm: str = DEFAULT_HASH_ALGORITHM) -> "DuplicateTracker":
+        """Create a tracker, pre-populated from a cache written by save().
+        
+        A missing, unreadable or mismatching cache (different algorithm or
+        digest size) is ignored and an empty tracker is returned. Recorded
+        files that no longer exist are dropped, so deleted or moved exports are
+        not treated as originals of new files.
+        
+        Args:
+            cache_path: JSON file written by save()
+            hash_algorithm: Hash algorithm the tracker must use
+            
+        Returns:
+            A DuplicateTracker for hash_algorithm
+        """
+        tracker = cls(hash_algorithm=hash_algorithm)
+        try:
+            payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return tracker
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable duplicate cache {cache_path}: {e}")
+            return tracker
+        
+        if (
+            payload.get("hash_algorithm") != hash_algorithm
+            or payload.get("digest_size") != tracker._digest_size
+        ):
+            logger.info(f"Ignoring duplicate cache {cache_path}: built with a different hash algorithm")
+            return tracker
+        stale = 0
+        try:
+            for digest, paths in payload.get("hashes", {}).items():
+                file_hash = bytes.fromhex(digest)
+                for path in map(Path, paths):
+                    if path.exists():
+                        tracker._insert(file_hash, path)
+                    else:
+                        stale += 1
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed duplicate cache {cache_path}: {e}")
+            tracker.seen_hashes = {}
+            tracker._total_files = 0
+        logger.debug(
+            f"Loaded {len(tracker.seen_hashes)} hashes from {cache_path} "
+            f"(dropped {stale} missing files)"
+        )
+        return tracker
+    
     def clear(self) -> None:
         """Clear all tracked hashes and start fresh."""
-        self.seen_hashes.clear()
+        with self._lock:
+            self.seen_hashes.clear()
+            self._total_files = 0
         logger.debug("Cleared duplicate tracker")
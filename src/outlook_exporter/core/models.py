@@ -9,10 +9,16 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
+from outlook_exporter.core.duplicates import DEFAULT_HASH_ALGORITHM
 
-@dataclass
+if TYPE_CHECKING:
+    from outlook_exporter.core.duplicates import DuplicateTracker
+    from outlook_exporter.storage.path_utils import UniquePathAllocator
+
+
+@dataclass(slots=True)
 class EmailMetadata:
     """Represents email metadata extracted from an Outlook message.
     
@@ -26,6 +32,11 @@ class EmailMetadata:
         cc_recipients: Semicolon-separated list of CC recipients
         body: Plain text body of the email
         html_body: HTML body of the email
+        body_loaded: False if body/html_body were not read yet (see
+            OutlookMessageAdapter.load_body)
+        subject_lower: Lowercased subject, computed once on first access
+        body_lower: Lowercased body, computed once on first access
+        sender_email_lower: Lowercased sender address, computed once on first access
     """
     subject: str
     sender_email: str
@@ -36,9 +47,48 @@ class EmailMetadata:
     cc_recipients: str
     body: str
     html_body: str
+    body_loaded: bool = field(default=True, repr=False, compare=False)
+    # Lazily filled caches for case-insensitive filters (functools.cached_property
+    # needs an instance __dict__, which slots=True removes)
+    _subject_lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _body_lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _sender_email_lower: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def subject_lower(self) -> str:
+        if self._subject_lower is None:
+            self._subject_lower = self.subject.lower()
+        return self._subject_lower
+
+    @property
+    def body_lower(self) -> str:
+        if self._body_lower is None:
+            self._body_lower = self.body.lower()
+        return self._body_lower
+
+    @property
+    def sender_email_lower(self) -> str:
+        if self._sender_email_lower is None:
+            self._sender_email_lower = self.sender_email.lower()
+        return self._sender_email_lower
+
+    def set_body(self, body: str, html_body: str = "") -> None:
+        """Fill in the bodies and mark them as loaded.
+        
+        Use this rather than assigning ``body`` directly so the cached
+        lowercase body is invalidated.
+        
+        Args:
+            body: Plain text body of the email
+            html_body: HTML body of the email
+        """
+        self.body = body
+        self.html_body = html_body
+        self._body_lower = None
+        self.body_loaded = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Attachment:
     """Represents an email attachment.
     
@@ -48,15 +98,17 @@ class Attachment:
         content_hash: Hash of file content (for duplicate detection)
         is_inline: Whether this is an inline attachment (e.g., signature image)
         position: Position in the email (0 for inline attachments)
+        path: Where the attachment was saved, once exported
     """
     filename: str
     size: int
     content_hash: Optional[str] = None
     is_inline: bool = False
     position: int = 0
+    path: Optional[Path] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportConfig:
     """Configuration for the export operation.
     
@@ -64,23 +116,30 @@ class ExportConfig:
         output_dir: Base directory for exported files
         include_inline: Whether to include inline attachments
         duplicates_subfolder: Name of subfolder for duplicate files
-        hash_algorithm: Algorithm to use for duplicate detection
+        hash_algorithm: Algorithm to use for duplicate detection (BLAKE2b,
+            truncated to 128 bits, by default)
         dry_run: If True, simulate export without writing files
         subject_sanitize_length: Max length for subject in folder names
-        batch_size: Number of messages to process in each batch
+        batch_size: Deprecated and ignored; messages are streamed one at a time
         limit: Maximum number of messages to process (None for unlimited)
+        duplicate_tracker: Tracker shared by every exporter using this config
+            (created by the first exporter if None)
+        path_allocator: Allocator of unique file names shared by every exporter
+            using this config (created by the first exporter if None)
     """
     output_dir: Path
     include_inline: bool = False
     duplicates_subfolder: str = "duplicates"
-    hash_algorithm: str = "sha256"
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM
     dry_run: bool = False
     subject_sanitize_length: int = 80
     batch_size: int = 200
     limit: Optional[int] = None
+    duplicate_tracker: Optional[DuplicateTracker] = None
+    path_allocator: Optional[UniquePathAllocator] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterCriteria:
     """Criteria for filtering emails.
     
@@ -104,7 +163,7 @@ class FilterCriteria:
     folder_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExportResult:
     """Result of an export operation.
     
@@ -5,20 +5,59 @@ and organized folder structures.
 """
 
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Any, Callable, Iterator, Optional, Set, Tuple
 
-from outlook_exporter.core.duplicates import DuplicateTracker
-from outlook_exporter.core.models import EmailMetadata, ExportResult
+from outlook_exporter.core.models import Attachment, EmailMetadata, ExportResult
 from outlook_exporter.exporters.base import BaseExporter
+from outlook_exporter.outlook.adapters import OutlookAttachmentAdapter
 from outlook_exporter.storage.path_utils import (
-    ensure_unique_path,
     sanitize_for_filesystem,
 )
+from outlook_exporter.utils.exceptions import DuplicateDetectionError
 
 
 logger = logging.getLogger(__name__)
 
+# Attachments up to this size are read and hashed in memory instead of via a temp file
+MAX_IN_MEMORY_ATTACHMENT = 64 * 1024 * 1024
+
+# At most the current and the previous attachment of a message are hashing at once
+HASH_WORKERS = 2
+
+
+@dataclass(slots=True)
+class _FetchedAttachment:
+    """Attachment content pulled out of Outlook, waiting to be hashed and stored.
+
+    Exactly one of ``data`` (in-memory content) and ``temp_path`` (file written
+    by SaveAsFile) is set, except in dry-run mode where neither is.
+    """
+    filename: str
+    folder: Path
+    size: int
+    data: Optional[bytes] = None
+    temp_path: Optional[Path] = None
+
+
+def _attachment_accessor(attachments) -> Tuple[int, Callable[[int], Any]]:
+    """Resolve how to read an Attachments collection once rather than per attachment.
+
+    Args:
+        attachments: Outlook Attachments COM collection or a plain sequence
+
+    Returns:
+        The number of attachments and a 1-based item getter
+    """
+    if isinstance(attachments, (list, tuple)):
+        def get_item(index: int) -> Any:
+            return attachments[index - 1]
+
+        return len(attachments), get_item
+    return int(attachments.Count), attachments.Item  # COM collections are 1-based
+
 
 class AttachmentExporter(BaseExporter):
     """Exports email attachments to organized folder structure.
@@ -30,9 +69,17 @@ class AttachmentExporter(BaseExporter):
     def __init__(self, *args, **kwargs):
         """Initialize the attachment exporter."""
         super().__init__(*args, **kwargs)
-        self.duplicate_tracker = DuplicateTracker(
-            algorithm=self.config.hash_algorithm
-        )
+        # Duplicates folders already created during this export
+        self._dup_folders: Set[Path] = set()
+        # Started on first use and shared by all messages; shut down in close()
+        self._hash_pool: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut down the hashing threads, then persist the duplicate registry."""
+        if self._hash_pool is not None:
+            self._hash_pool.shutdown(wait=True)
+            self._hash_pool = None
+        super().close()
 
     def export(
         self,
@@ -51,50 +98,121 @@ class AttachmentExporter(BaseExporter):
             Path to the folder containing exported attachments
         """
         folder = self._create_base_folder(email)
-        attachments_saved = 0
+        attachments_saved = sum(1 for _ in self._iter_saved_attachments(outlook_message, folder, email, result))
+
+        result.attachments_saved += attachments_saved
+        return folder if attachments_saved > 0 else None
+
+    def _iter_saved_attachments(
+        self,
+        outlook_message,
+        folder: Path,
+        email: Optional[EmailMetadata],
+        result: ExportResult,
+    ) -> Iterator[Attachment]:
+        """Save each attachment of a message and yield the ones that were saved.
+
+        The Attachments collection is walked exactly once, so every exporter
+        that needs attachments shares the same COM round trips. hashlib
+        releases the GIL, so attachment N is hashed on a worker thread while
+        Outlook is still handing over attachment N+1. The worker pool lives as
+        long as the exporter; an attachment still pending when the generator
+        is closed early has its temp file removed.
+
+        Args:
+            outlook_message: Outlook COM message object
+            folder: Folder to save attachments in
+            email: Email metadata for logging (optional for MarkdownExporter)
+            result: Export result to record access errors in
 
-        # Get attachments from COM object
+        Yields:
+            Saved attachments with their final paths, sizes and content hashes
+        """
         try:
-            attachments = outlook_message.Attachments
-            count = attachments.Count if hasattr(attachments, "Count") else len(attachments)
+            count, get_item = _attachment_accessor(outlook_message.Attachments)
         except Exception as e:
+            subject = email.subject if email else "message"
             logger.warning(f"Failed to access attachments: {e}")
-            result.add_error(f"Failed to access attachments for '{email.subject}': {e}")
-            return None
+            result.add_error(f"Failed to access attachments for '{subject}': {e}")
+            return
 
-        # Process each attachment
-        for i in range(1, count + 1):
-            try:
-                if hasattr(attachments, "Item"):
-                    attachment = attachments.Item(i)
-                else:
-                    attachment = attachments[i - 1]
+        # COM access stays on this thread; hashing of the previous attachment
+        # runs in the pool while the next one is fetched from Outlook
+        pending: Optional[Tuple[_FetchedAttachment, Future]] = None
+        try:
+            for i in range(1, count + 1):
+                try:
+                    fetched = self._fetch_attachment(get_item(i), folder)
+                except Exception as e:
+                    logger.debug(f"Error accessing attachment {i}: {e}")
+                    continue
+                if fetched is None:
+                    continue
 
-                if self._save_attachment(attachment, folder, email):
-                    attachments_saved += 1
+                if self.config.dry_run:
+                    yield self._store_attachment(fetched, None)
+                    continue
 
-            except Exception as e:
-                logger.debug(f"Error accessing attachment {i}: {e}")
-                continue
+                if self._hash_pool is None:
+                    self._hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="attachment-hash")
+                previous, pending = pending, (fetched, self._hash_pool.submit(self._hash_attachment, fetched))
+                if previous is not None:
+                    saved = self._finish_attachment(*previous)
+                    if saved:
+                        yield saved
 
-        result.attachments_saved += attachments_saved
-        return folder if attachments_saved > 0 else None
+            if pending is not None:
+                previous, pending = pending, None
+                saved = self._finish_attachment(*previous)
+                if saved:
+                    yield saved
+        finally:
+            if pending is not None:
+                self._abandon_attachment(*pending)
 
     def _save_attachment(
         self,
         attachment,
         folder: Path,
         email: Optional[EmailMetadata],
-    ) -> bool:
+    ) -> Optional[Attachment]:
         """Save a single attachment to disk.
 
+        The content is read and hashed in memory when possible, so it is
+        written exactly once; otherwise Outlook saves it to a temporary file
+        which is hashed from disk.
+
         Args:
             attachment: Outlook attachment COM object
             folder: Folder to save the attachment in
             email: Email metadata for logging (optional for MarkdownExporter)
 
         Returns:
-            True if attachment was saved successfully
+            The saved attachment (with its path, size and content hash),
+            or None if it was skipped or could not be saved
+        """
+        fetched = self._fetch_attachment(attachment, folder)
+        if fetched is None:
+            return None
+        if self.config.dry_run:
+            return self._store_attachment(fetched, None)
+        try:
+            file_hash = self._hash_attachment(fetched)
+        except DuplicateDetectionError as e:
+            logger.warning(f"Failed to hash attachment {fetched.filename}: {e}")
+            self._discard_temp(fetched)
+            return None
+        return self._store_attachment(fetched, file_hash)
+
+    def _fetch_attachment(self, attachment, folder: Path) -> Optional[_FetchedAttachment]:
+        """Pull an attachment's content out of Outlook (must run on the COM thread).
+
+        Args:
+            attachment: Outlook attachment COM object
+            folder: Folder the attachment will be saved in
+
+        Returns:
+            The fetched attachment, or None if it is skipped or cannot be read
         """
         # Skip inline attachments unless configured to include them
         if not self.config.include_inline:
@@ -103,7 +221,7 @@ class AttachmentExporter(BaseExporter):
                 att_type = getattr(attachment, "Type", None)
                 if position == 0 and att_type == 5:  # Likely inline
                     logger.debug("Skipping inline attachment")
-                    return False
+                    return None
             except Exception:
                 pass
 
@@ -113,40 +231,107 @@ class AttachmentExporter(BaseExporter):
             filename = sanitize_for_filesystem(filename, max_length=255)
         except Exception as e:
             logger.warning(f"Failed to get attachment filename: {e}")
-            return False
-
-        # Determine save path
-        dest_path = folder / filename
+            return None
 
         if self.config.dry_run:
-            logger.info(f"[DRY-RUN] Would save attachment: {dest_path}")
-            return True
+            return _FetchedAttachment(filename, folder, getattr(attachment, "Size", 0) or 0)
+
+        # Hash in memory when the content is available; fall back to a temp file
+        data = OutlookAttachmentAdapter(attachment).read_content(MAX_IN_MEMORY_ATTACHMENT)
+        if data is not None:
+            return _FetchedAttachment(filename, folder, len(data), data=data)
 
-        # Save to temporary file first
-        temp_path = dest_path.with_suffix(dest_path.suffix + ".tmp")
+        # Unique, because the previous attachment's temp file may still be hashing
+        temp_path = self.path_allocator.allocate(folder / (filename + ".tmp"))
         try:
             attachment.SaveAsFile(str(temp_path))
         except Exception as e:
             logger.warning(f"Failed to save attachment {filename}: {e}")
-            return False
+            return None
+        return _FetchedAttachment(filename, folder, temp_path.stat().st_size, temp_path=temp_path)
+
+    def _hash_attachment(self, fetched: _FetchedAttachment) -> bytes:
+        """Compute the raw digest of fetched content (safe to run on a worker thread)."""
+        if fetched.data is not None:
+            return self.duplicate_tracker.compute_data_digest(fetched.data)
+        return self.duplicate_tracker.compute_file_digest(fetched.temp_path)
+
+    def _finish_attachment(self, fetched: _FetchedAttachment, future: Future) -> Optional[Attachment]:
+        """Wait for a background hash, then store the attachment."""
+        try:
+            file_hash = future.result()
+        except DuplicateDetectionError as e:
+            logger.warning(f"Failed to hash attachment {fetched.filename}: {e}")
+            self._discard_temp(fetched)
+            return None
+        return self._store_attachment(fetched, file_hash)
+
+    def _abandon_attachment(self, fetched: _FetchedAttachment, future: Future) -> None:
+        """Drop an attachment that will never be stored, once its hash is no longer reading it."""
+        if not future.cancel():
+            wait([future])
+        self._discard_temp(fetched)
+
+    @staticmethod
+    def _discard_temp(fetched: _FetchedAttachment) -> None:
+        """Remove the temp file of an attachment that will not be stored."""
+        if fetched.temp_path is None:
+            return
+        try:
+            fetched.temp_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Failed to remove temp file {fetched.temp_path}: {e}")
+
+    def _store_attachment(
+        self,
+        fetched: _FetchedAttachment,
+        file_hash: Optional[bytes],
+    ) -> Optional[Attachment]:
+        """Check a fetched attachment for duplicates and write it to its final path.
+
+        Args:
+            fetched: The fetched attachment
+            file_hash: Raw digest of its content (None in dry-run mode)
+
+        Returns:
+            The saved attachment, or None if it could not be written
+        """
+        filename = fetched.filename
+        folder = fetched.folder
+        dest_path = folder / filename
+
+        if self.config.dry_run:
+            logger.info(f"[DRY-RUN] Would save attachment: {dest_path}")
+            return Attachment(filename=filename, size=fetched.size, path=dest_path)
 
         # Check for duplicates
-        file_hash = self.duplicate_tracker.compute_hash(temp_path)
         is_duplicate = self.duplicate_tracker.is_duplicate(file_hash)
 
         if is_duplicate:
             # Move to duplicates subfolder
             dup_folder = folder / self.config.duplicates_subfolder
-            dup_folder.mkdir(parents=True, exist_ok=True)
-            final_path = ensure_unique_path(dup_folder / filename)
-            temp_path.rename(final_path)
+            if dup_folder not in self._dup_folders:
+                dup_folder.mkdir(parents=True, exist_ok=True)
+                self._dup_folders.add(dup_folder)
+            final_path = self.path_allocator.allocate(dup_folder / filename)
+        else:
+            final_path = self.path_allocator.allocate(dest_path)
+
+        try:
+            if fetched.temp_path is not None:
+                fetched.temp_path.replace(final_path)
+            else:
+                with final_path.open("wb") as f:
+                    f.write(fetched.data)
+        except OSError as e:
+            logger.warning(f"Failed to write attachment {final_path}: {e}")
+            self._discard_temp(fetched)
+            return None
+
+        if is_duplicate:
             logger.info(f"Duplicate detected: {final_path}")
-            self.duplicate_tracker.add_duplicate(file_hash, final_path)
         else:
-            # Save as new file
-            final_path = ensure_unique_path(dest_path)
-            temp_path.rename(final_path)
             logger.debug(f"Saved attachment: {final_path}")
-            self.duplicate_tracker.add_file(file_hash, final_path)
+        self.duplicate_tracker.register_file(final_path, file_hash)
 
-        return True
+        return Attachment(filename=final_path.name, size=fetched.size, content_hash=file_hash.hex(), path=final_path)
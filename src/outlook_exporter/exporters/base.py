@@ -4,11 +4,19 @@ This module defines the abstract base class for all exporters,
 following the Strategy pattern for flexible export implementations.
 """
 
+import functools
+import logging
 from abc import ABC, abstractmethod
+from datetime import date
 from pathlib import Path
 from typing import Optional
 
+from outlook_exporter.core.duplicates import CACHE_FILENAME, DuplicateTracker
 from outlook_exporter.core.models import EmailMetadata, ExportConfig, ExportResult
+from outlook_exporter.storage.path_utils import UniquePathAllocator
+from outlook_exporter.utils.exceptions import DuplicateDetectionError
+
+logger = logging.getLogger(__name__)
 
 
 class BaseExporter(ABC):
@@ -16,6 +24,12 @@ class BaseExporter(ABC):
 
     Exporters handle the actual export of emails and attachments to disk,
     implementing different strategies (attachments only, full .msg, markdown, etc.).
+    Use an exporter as a context manager (or call close()) so the duplicate
+    registry is persisted once the export is done.
+
+    Example:
+        >>> with ExporterFactory.create_exporter(config, "attachments") as exporter:
+        ...     exporter.export(email, outlook_message, result)
     """
 
     def __init__(self, config: ExportConfig):
@@ -25,6 +39,27 @@ class BaseExporter(ABC):
             config: Export configuration settings
         """
         self.config = config
+        # Shared, so exporters writing into the same folder see each
+        # other's file names
+        if config.path_allocator is None:
+            config.path_allocator = UniquePathAllocator()
+        self.path_allocator = config.path_allocator
+        # Replies in a thread share sender, subject and day, so the folder (and
+        # its mkdir) is resolved once per distinct combination
+        self._folder_for = functools.lru_cache(maxsize=4096)(self._make_folder)
+
+    @property
+    def duplicate_tracker(self) -> DuplicateTracker:
+        """The duplicate registry shared by every exporter using this config.
+
+        Loaded from the output directory's cache on first use, so exporters
+        that never check for duplicates do not read it.
+        """
+        if self.config.duplicate_tracker is None:
+            self.config.duplicate_tracker = DuplicateTracker.load(
+                self._duplicate_cache_path(), hash_algorithm=self.config.hash_algorithm
+            )
+        return self.config.duplicate_tracker
 
     @abstractmethod
     def export(
@@ -45,6 +80,32 @@ class BaseExporter(ABC):
         """
         pass
 
+    def __enter__(self) -> "BaseExporter":
+        """Context manager entry - returns the exporter itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit - closes the exporter."""
+        self.close()
+
+    def close(self) -> None:
+        """Release any resources held by the exporter.
+
+        Called once after the last email has been exported. Persists the
+        duplicate registry to the output directory if it was used.
+        """
+        tracker = self.config.duplicate_tracker
+        if self.config.dry_run or tracker is None or not tracker.seen_hashes:
+            return
+        try:
+            tracker.save(self._duplicate_cache_path())
+        except DuplicateDetectionError as e:
+            logger.warning(str(e))
+
+    def _duplicate_cache_path(self) -> Path:
+        """Return where the duplicate registry is persisted between runs."""
+        return self.config.output_dir / CACHE_FILENAME
+
     def _create_base_folder(self, email: EmailMetadata) -> Path:
         """Create the base folder structure for an email.
 
@@ -53,6 +114,19 @@ class BaseExporter(ABC):
         Args:
             email: Email metadata containing sender, subject, and date info
 
+        Returns:
+            Path to the created folder
+        """
+        return self._folder_for(email.sender_email, email.subject, email.received_time.date())
+
+    def _make_folder(self, sender_email: str, subject: str, received_date: date) -> Path:
+        """Build and create the folder for a sender/subject/date combination.
+
+        Args:
+            sender_email: Sender's email address
+            subject: Email subject line
+            received_date: Date the email was received
+
         Returns:
             Path to the created folder
         """
@@ -60,9 +134,9 @@ class BaseExporter(ABC):
 
         folder_path = create_email_folder_path(
             base_dir=self.config.output_dir,
-            sender_email=email.sender_email,
-            subject=email.subject,
-            received_time=email.received_time,
+            sender_email=sender_email,
+            subject=subject,
+            date_str=received_date.strftime("%Y-%m-%d"),
             subject_max_length=self.config.subject_sanitize_length,
         )
 
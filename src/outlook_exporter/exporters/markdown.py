@@ -4,14 +4,16 @@ This module exports emails as markdown files with YAML frontmatter,
 ideal for archival and LLM processing.
 """
 
+import functools
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
-from outlook_exporter.core.models import EmailMetadata, ExportResult
+from outlook_exporter.core.models import Attachment, EmailMetadata, ExportResult
 from outlook_exporter.exporters.attachment import AttachmentExporter
+from outlook_exporter.outlook.adapters import OutlookMessageAdapter
 from outlook_exporter.storage.path_utils import (
-    ensure_unique_path,
     format_file_size,
     get_relative_path,
     sanitize_for_filesystem,
@@ -24,6 +26,35 @@ except ImportError:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+# Fixed layout of the frontmatter and header; optional To/CC lines are
+# substituted whole (or as empty strings) so rendering is a single format call
+_HEADER_TEMPLATE = (
+    "---\n"
+    "from: {sender_email}\n"
+    "{to_field}"
+    "{cc_field}"
+    "subject: {subject}\n"
+    "date: {date}\n"
+    "received: {received}\n"
+    "---\n"
+    "\n"
+    "# {subject}\n"
+    "\n"
+    "**From:** {sender_name} ({sender_email})  \n"
+    "{to_line}"
+    "{cc_line}"
+    "**Date:** {display_date}\n"
+    "\n"
+    "---\n"
+    "\n"
+)
+
+
+@functools.lru_cache(maxsize=8192)
+def _format_display_date(value: datetime) -> str:
+    """Format a timestamp for the markdown header (memoized; strftime is locale-aware and slow)."""
+    return value.strftime('%B %d, %Y %I:%M %p')
+
 
 class MarkdownExporter(AttachmentExporter):
     """Exports emails as markdown files with attachments.
@@ -55,13 +86,13 @@ class MarkdownExporter(AttachmentExporter):
             result.add_error("markdownify library not installed")
             return None
 
-        folder = self._create_base_folder(email)
+        if not email.body_loaded:
+            OutlookMessageAdapter(outlook_message).load_body(email)
 
-        # First, save all attachments to reference them
-        saved_attachments = self._export_attachments(outlook_message, folder, result)
+        folder = self._create_base_folder(email)
 
-        # Create markdown content
-        markdown_content = self._create_markdown(email, saved_attachments, folder)
+        # First, save all attachments (single pass over the collection) to reference them
+        saved_attachments = list(self._iter_saved_attachments(outlook_message, folder, email, result))
 
         # Save markdown file
         filename = sanitize_for_filesystem(email.subject, max_length=255) + ".md"
@@ -72,11 +103,13 @@ class MarkdownExporter(AttachmentExporter):
             result.attachments_saved += 1
             return dest_path
 
-        final_path = ensure_unique_path(dest_path)
+        final_path = self.path_allocator.allocate(dest_path)
 
         try:
+            # Stream the document; the converted body is written as one chunk
+            # without being copied into a joined string first
             with final_path.open("w", encoding="utf-8") as f:
-                f.write(markdown_content)
+                f.writelines(self._iter_markdown_lines(email, saved_attachments, final_path))
             logger.info(f"Saved markdown: {final_path}")
             result.files_exported += 1
             return final_path
@@ -85,122 +118,64 @@ class MarkdownExporter(AttachmentExporter):
             result.add_error(f"Failed to save markdown '{email.subject}': {e}")
             return None
 
-    def _export_attachments(
-        self,
-        outlook_message,
-        folder: Path,
-        result: ExportResult,
-    ) -> List[Path]:
-        """Export all attachments and return their paths.
-
-        Args:
-            outlook_message: Outlook COM message object
-            folder: Folder to save attachments in
-            result: Export result to update
-
-        Returns:
-            List of paths to saved attachments
-        """
-        saved = []
-        try:
-            attachments = outlook_message.Attachments
-            count = attachments.Count if hasattr(attachments, "Count") else len(attachments)
-
-            for i in range(1, count + 1):
-                try:
-                    if hasattr(attachments, "Item"):
-                        attachment = attachments.Item(i)
-                    else:
-                        attachment = attachments[i - 1]
-
-                    # Create a fake email metadata for attachment saving
-                    # (reusing parent method which needs it)
-                    if self._save_attachment(attachment, folder, None):
-                        # Get the filename to add to saved list
-                        filename = getattr(attachment, "FileName", "attachment.bin")
-                        saved.append(folder / sanitize_for_filesystem(filename, 255))
-                except Exception as e:
-                    logger.debug(f"Error accessing attachment {i}: {e}")
-                    continue
-
-        except Exception as e:
-            logger.warning(f"Failed to access attachments: {e}")
-
-        return saved
-
-    def _create_markdown(
+    def _iter_markdown_lines(
         self,
         email: EmailMetadata,
-        attachments: List[Path],
+        attachments: List[Attachment],
         markdown_path: Path,
-    ) -> str:
-        """Create markdown content with YAML frontmatter.
+    ) -> Iterator[str]:
+        """Generate the markdown document with YAML frontmatter, line by line.
 
         Args:
             email: Email metadata
-            attachments: List of saved attachment paths
+            attachments: List of saved attachments
             markdown_path: Path where markdown will be saved (for relative paths)
 
-        Returns:
-            Complete markdown content as string
+        Yields:
+            Lines of the document, each ending with a newline
         """
-        lines = []
-
-        # YAML frontmatter
-        lines.append("---")
-        lines.append(f"from: {email.sender_email}")
-        if email.to_recipients:
-            lines.append(f"to: {email.to_recipients}")
-        if email.cc_recipients:
-            lines.append(f"cc: {email.cc_recipients}")
-        lines.append(f"subject: {email.subject}")
-        lines.append(f"date: {email.sent_time.isoformat() if email.sent_time else email.received_time.isoformat()}")
-        lines.append(f"received: {email.received_time.isoformat()}")
-        lines.append("---")
-        lines.append("")
-
-        # Email header section
-        lines.append(f"# {email.subject}")
-        lines.append("")
-        lines.append(f"**From:** {email.sender_name} ({email.sender_email})  ")
-        if email.to_recipients:
-            lines.append(f"**To:** {email.to_recipients}  ")
-        if email.cc_recipients:
-            lines.append(f"**CC:** {email.cc_recipients}  ")
-
-        sent_time = email.sent_time or email.received_time
-        lines.append(f"**Date:** {sent_time.strftime('%B %d, %Y %I:%M %p')}")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        # YAML frontmatter and header
+        to, cc = email.to_recipients, email.cc_recipients
+        received = email.received_time
+        sent_time = email.sent_time or received
+        yield _HEADER_TEMPLATE.format_map({
+            "sender_email": email.sender_email,
+            "sender_name": email.sender_name,
+            "subject": email.subject,
+            "to_field": f"to: {to}\n" if to else "",
+            "cc_field": f"cc: {cc}\n" if cc else "",
+            "to_line": f"**To:** {to}  \n" if to else "",
+            "cc_line": f"**CC:** {cc}  \n" if cc else "",
+            "date": sent_time.isoformat(),
+            "received": received.isoformat(),
+            "display_date": _format_display_date(sent_time),
+        })
 
         # Email body (convert HTML to markdown)
         if email.html_body:
             try:
                 body_md = md(email.html_body, heading_style="ATX", bullets="-")
-                lines.append(body_md)
             except Exception as e:
                 logger.warning(f"Failed to convert HTML to markdown: {e}")
-                lines.append(email.body or "")
+                body_md = email.body or ""
         else:
-            lines.append(email.body or "")
-
-        lines.append("")
+            body_md = email.body or ""
+        yield body_md
+        yield "\n"
+        yield "\n"
 
         # Attachments section
         if attachments:
-            lines.append("---")
-            lines.append("")
-            lines.append("## Attachments")
-            lines.append("")
-            for att_path in attachments:
+            yield "---\n"
+            yield "\n"
+            yield "## Attachments\n"
+            yield "\n"
+            for attachment in attachments:
+                att_path = attachment.path
                 try:
-                    size = att_path.stat().st_size
-                    size_str = format_file_size(size)
-                    rel_path = get_relative_path(att_path, markdown_path.parent)
-                    lines.append(f"- [{att_path.name}]({rel_path}) ({size_str})")
+                    size_str = format_file_size(attachment.size)
+                    rel_path = get_relative_path(markdown_path, att_path)
+                    yield f"- [{att_path.name}]({rel_path}) ({size_str})\n"
                 except Exception as e:
                     logger.debug(f"Failed to get attachment info for {att_path}: {e}")
-                    lines.append(f"- {att_path.name}")
-
-        return "\n".join(lines)
+                    yield f"- {att_path.name}\n"
@@ -10,7 +10,6 @@ from typing import Optional
 from outlook_exporter.core.models import EmailMetadata, ExportResult
 from outlook_exporter.exporters.base import BaseExporter
 from outlook_exporter.storage.path_utils import (
-    ensure_unique_path,
     sanitize_for_filesystem,
 )
 
@@ -53,7 +52,7 @@ class MessageExporter(BaseExporter):
             return dest_path
 
         # Ensure unique path
-        final_path = ensure_unique_path(dest_path)
+        final_path = self.path_allocator.allocate(dest_path)
 
         # Save the message
         try:
@@ -5,7 +5,7 @@ following the Strategy pattern for flexible and composable filtering.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from outlook_exporter.core.models import EmailMetadata
 
@@ -15,8 +15,18 @@ class EmailFilter(ABC):
     
     All concrete filters must implement the matches() method to define
     their filtering logic.
+    
+    Attributes:
+        cost: Relative evaluation cost; CompositeFilter runs cheaper filters first
+        needs_body: Whether matches() reads the email body, so callers can skip
+            fetching bodies when no filter inspects them
     """
     
+    __slots__ = ()
+    
+    cost: int = 99
+    needs_body: bool = True
+    
     @abstractmethod
     def matches(self, email: EmailMetadata) -> bool:
         """Check if an email matches this filter's criteria.
@@ -28,6 +38,52 @@ class EmailFilter(ABC):
             True if the email matches the filter criteria, False otherwise
         """
         pass
+    
+    def to_dasl(self) -> Optional[str]:
+        """Translate this filter into a DASL clause for Items.Restrict.
+        
+        Restricting the folder lets the MAPI store discard non-matching
+        messages before they are marshalled to Python. The clause may be
+        looser than the filter's criteria (matches() is still applied), but
+        never stricter.
+        
+        Returns:
+            A DASL clause (without the ``@SQL=`` prefix), or None if this filter
+            can only be evaluated in Python
+        """
+        return None
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit a Python boolean expression equivalent to matches().
+        
+        CompositeFilter joins the expressions of its components into a single
+        generated predicate. Values the expression needs must be stored in
+        ``ns`` via bind(); user-provided data never becomes part of the source.
+        The default expression simply calls this filter's matches().
+        
+        Args:
+            var: Name of the variable holding the email in the generated code
+            ns: Namespace the generated code is executed in
+            
+        Returns:
+            Source of a boolean expression
+        """
+        return f"{bind(ns, self.matches)}({var})"
+
+
+def bind(ns: Dict[str, Any], value: Any) -> str:
+    """Store a value in a code generation namespace under a fresh name.
+    
+    Args:
+        ns: Namespace the generated code is executed in
+        value: Object the generated code refers to
+        
+    Returns:
+        The name under which the value is stored
+    """
+    name = f"_c{len(ns)}"
+    ns[name] = value
+    return name
 
 
 class CompositeFilter(EmailFilter):
@@ -35,32 +91,81 @@ class CompositeFilter(EmailFilter):
     
     An email must match all component filters to pass this composite filter.
     This allows building complex filter logic from simple components.
+    Component filters are evaluated cheapest first (by their ``cost``) and
+    evaluation stops at the first filter that rejects the email.
+    
+    At construction the component filters are compiled into one generated
+    predicate, which matches() calls, so per-email matching does not walk the
+    filter list. Changes made to the component filters afterwards are not
+    picked up.
     
     Example:
         >>> date_filter = DateRangeFilter(start_date, end_date)
         >>> sender_filter = SenderFilter(['user@example.com'])
         >>> composite = CompositeFilter([date_filter, sender_filter])
         >>> composite.matches(email)  # True only if both filters match
+    
+    Attributes:
+        filters: Component filters, cheapest first
+        needs_body: Whether any component filter reads the email body
     """
     
+    __slots__ = ('_predicate', 'filters', 'needs_body')
+    
     def __init__(self, filters: List[EmailFilter]):
         """Initialize the composite filter.
         
         Args:
             filters: List of filters to combine with AND logic
         """
-        self.filters = filters
+        # Stable sort: filters of equal cost keep their given order
+        self.filters = sorted(filters, key=lambda f: f.cost)
+        self.needs_body = any(f.needs_body for f in self.filters)
+        
+        ns: Dict[str, Any] = {}
+        source = f"def _pred(e):\n    return {self.emit('e', ns)}\n"
+        exec(compile(source, "<CompositeFilter>", "exec"), ns)
+        self._predicate = ns["_pred"]
     
     def matches(self, email: EmailMetadata) -> bool:
-        """Check if email matches all component filters.
+        """Check if an email matches all component filters.
         
         Args:
             email: The email metadata to check
             
         Returns:
-            True if email matches all filters, False otherwise
+            True if every component filter matches, False otherwise
+        """
+        return self._predicate(email)
+    
+    def to_dasl(self) -> Optional[str]:
+        """Combine the DASL clauses of all component filters that have one.
+        
+        Components without a clause are left to matches().
+        
+        Returns:
+            The AND of the component clauses, or None if there are none
         """
-        return all(filter.matches(email) for filter in self.filters)
+        clauses = [c for c in (f.to_dasl() for f in self.filters) if c]
+        if not clauses:
+            return None
+        if len(clauses) == 1:
+            return clauses[0]
+        return " AND ".join(f"({c})" for c in clauses)
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit the AND of all component filter expressions.
+        
+        Args:
+            var: Name of the variable holding the email in the generated code
+            ns: Namespace the generated code is executed in
+            
+        Returns:
+            Source of a boolean expression
+        """
+        if not self.filters:
+            return "True"
+        return " and ".join(f"({f.emit(var, ns)})" for f in self.filters)
 
 
 class PassThroughFilter(EmailFilter):
@@ -69,6 +174,10 @@ class PassThroughFilter(EmailFilter):
     Useful as a default or null filter when no filtering is needed.
     """
     
+    __slots__ = ()
+    
+    needs_body = False
+    
     def matches(self, email: EmailMetadata) -> bool:
         """Always returns True.
         
@@ -79,3 +188,7 @@ class PassThroughFilter(EmailFilter):
             Always True
         """
         return True
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit a constant True expression."""
+        return "True"
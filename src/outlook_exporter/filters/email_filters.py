@@ -4,11 +4,121 @@ This module contains specific filter implementations for common filtering
 scenarios like date ranges, senders, and keyword matching.
 """
 
-from datetime import datetime
-from typing import List
+from datetime import UTC, datetime, timedelta
+from typing import Any, Dict, List, Optional
 
 from outlook_exporter.core.models import EmailMetadata
-from outlook_exporter.filters.base import EmailFilter
+from outlook_exporter.filters.base import EmailFilter, bind
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover
+    ahocorasick = None
+
+# DASL property names used to push filters down to Items.Restrict
+DASL_RECEIVED = '"urn:schemas:httpmail:datereceived"'
+DASL_SENDER_EMAIL = '"http://schemas.microsoft.com/mapi/proptag/0x0C1F001F"'
+DASL_HAS_ATTACHMENT = '"urn:schemas:httpmail:hasattachment"'
+
+# Below this many keywords, separate str.__contains__ scans beat an automaton pass
+AUTOMATON_MIN_KEYWORDS = 3
+
+
+def _dasl_time(value: datetime) -> str:
+    """Format a local datetime for a DASL comparison (DASL dates are UTC).
+    
+    Args:
+        value: Naive local or timezone-aware datetime
+        
+    Returns:
+        The UTC time formatted as a DASL date literal
+    """
+    return value.astimezone(UTC).strftime('%Y-%m-%d %H:%M')
+
+
+def _dasl_quote(value: str) -> str:
+    """Escape a string literal for a DASL query.
+    
+    Args:
+        value: Raw string value
+        
+    Returns:
+        The value quoted for use in a DASL comparison
+    """
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _build_automaton(keywords: List[str]) -> Optional[Any]:
+    """Compile keywords into an Aho-Corasick automaton for single-pass matching.
+    
+    Args:
+        keywords: Lowercased keywords
+        
+    Returns:
+        The automaton, or None when pyahocorasick is not installed or there are
+        too few distinct keywords for it to pay off
+    """
+    distinct = [kw for kw in dict.fromkeys(keywords) if kw]
+    if ahocorasick is None or len(distinct) < AUTOMATON_MIN_KEYWORDS:
+        return None
+    automaton = ahocorasick.Automaton()
+    for idx, kw in enumerate(distinct):
+        automaton.add_word(kw, idx)
+    automaton.make_automaton()
+    return automaton
+
+
+def _contains_all(text: str, keywords: List[str], automaton: Optional[Any]) -> bool:
+    """Check that every keyword occurs in text.
+    
+    Args:
+        text: Lowercased text to search
+        keywords: Lowercased keywords
+        automaton: Automaton from _build_automaton, or None to scan per keyword
+        
+    Returns:
+        True if all keywords are found, False otherwise
+    """
+    if automaton is None:
+        return all(kw in text for kw in keywords)
+    
+    # One linear sweep, recording which keywords were seen; stop once all are
+    remaining = len(automaton)
+    seen = 0
+    for _, idx in automaton.iter(text):
+        bit = 1 << idx
+        if not seen & bit:
+            seen |= bit
+            remaining -= 1
+            if not remaining:
+                return True
+    return False
+
+
+def _emit_contains_all(text_expr: str, keywords: List[str], automaton: Optional[Any],
+                       ns: Dict[str, Any]) -> str:
+    """Emit an expression checking that every keyword occurs in a text.
+    
+    Args:
+        text_expr: Expression evaluating to the lowercased text
+        keywords: Lowercased keywords
+        automaton: Automaton from _build_automaton, or None
+        ns: Namespace the generated code is executed in
+        
+    Returns:
+        Source of a boolean expression
+    """
+    if not keywords:
+        return "True"
+    if automaton is not None:
+        return (f"{bind(ns, _contains_all)}({text_expr}, "
+                f"{bind(ns, keywords)}, {bind(ns, automaton)})")
+    # Unroll the keyword checks, evaluating the text once into a fresh local
+    text = bind(ns, None)
+    first, *rest = keywords
+    checks = [f"{bind(ns, first)} in ({text} := {text_expr})"]
+    checks.extend(f"{bind(ns, kw)} in {text}" for kw in rest)
+    return " and ".join(checks)
 
 class DateRangeFilter(EmailFilter):
     """Filter emails by received date range.
@@ -18,6 +128,11 @@ class DateRangeFilter(EmailFilter):
         end_date: Maximum received date (inclusive), None for no upper bound
     """
     
+    __slots__ = ('end_date', 'start_date')
+    
+    cost = 0
+    needs_body = False
+    
     def __init__(self, start_date: datetime | None = None, end_date: datetime | None = None):
         """Initialize the date range filter.
         
@@ -37,11 +152,39 @@ class DateRangeFilter(EmailFilter):
         Returns:
             True if email date is within range, False otherwise
         """
-        if self.start_date and email.received_time < self.start_date:
-            return False
-        if self.end_date and email.received_time > self.end_date:
-            return False
+        start, end = self.start_date, self.end_date
+        if start and end:
+            return start <= email.received_time <= end
+        if start:
+            return email.received_time >= start
+        if end:
+            return email.received_time <= end
         return True
+    
+    def to_dasl(self) -> Optional[str]:
+        """Restrict on the received date; DASL compares at minute resolution."""
+        clauses = []
+        if self.start_date:
+            # Round down so the store never drops a message matches() would keep
+            start = self.start_date.replace(second=0, microsecond=0)
+            clauses.append(f"{DASL_RECEIVED} >= '{_dasl_time(start)}'")
+        if self.end_date:
+            # Round up for the same reason
+            end = self.end_date
+            if end.second or end.microsecond:
+                end = end.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            clauses.append(f"{DASL_RECEIVED} <= '{_dasl_time(end)}'")
+        return " AND ".join(clauses) or None
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit the date range check as an inline comparison."""
+        if self.start_date and self.end_date:
+            return f"{bind(ns, self.start_date)} <= {var}.received_time <= {bind(ns, self.end_date)}"
+        if self.start_date:
+            return f"{var}.received_time >= {bind(ns, self.start_date)}"
+        if self.end_date:
+            return f"{var}.received_time <= {bind(ns, self.end_date)}"
+        return "True"
 
 class SenderFilter(EmailFilter):
     """Filter emails by sender email address.
@@ -49,16 +192,21 @@ class SenderFilter(EmailFilter):
     Performs case-insensitive exact matching against a list of allowed senders.
     
     Attributes:
-        senders: List of allowed sender email addresses
+        senders: Set of allowed sender email addresses (lowercased)
     """
     
+    __slots__ = ('senders',)
+    
+    cost = 1
+    needs_body = False
+    
     def __init__(self, senders: List[str]):
         """Initialize the sender filter.
         
         Args:
             senders: List of sender email addresses to match (case-insensitive)
         """
-        self.senders = [s.lower() for s in senders]
+        self.senders = frozenset(s.lower() for s in senders)
     
     def matches(self, email: EmailMetadata) -> bool:
         """Check if email sender matches any of the allowed senders.
@@ -69,7 +217,19 @@ class SenderFilter(EmailFilter):
         Returns:
             True if sender matches, False otherwise
         """
-        return email.sender_email.lower() in self.senders
+        return email.sender_email_lower in self.senders
+    
+    def to_dasl(self) -> Optional[str]:
+        """Restrict on the sender address (MAPI string comparison is case-insensitive)."""
+        if not self.senders:
+            return None
+        return " OR ".join(
+            f"{DASL_SENDER_EMAIL} = {_dasl_quote(s)}" for s in sorted(self.senders)
+        )
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit the sender check as an inline set lookup."""
+        return f"{var}.sender_email_lower in {bind(ns, self.senders)}"
 
 class SubjectKeywordFilter(EmailFilter):
     """Filter emails by keywords in the subject line.
@@ -81,6 +241,11 @@ class SubjectKeywordFilter(EmailFilter):
         keywords: List of keywords that must all appear in subject
     """
     
+    __slots__ = ('_automaton', 'keywords')
+    
+    cost = 3
+    needs_body = False
+    
     def __init__(self, keywords: List[str]):
         """Initialize the subject keyword filter.
         
@@ -88,6 +253,7 @@ class SubjectKeywordFilter(EmailFilter):
             keywords: Keywords that must all appear in subject (case-insensitive)
         """
         self.keywords = [kw.lower() for kw in keywords]
+        self._automaton = _build_automaton(self.keywords)
     
     def matches(self, email: EmailMetadata) -> bool:
         """Check if all keywords appear in the subject.
@@ -98,8 +264,11 @@ class SubjectKeywordFilter(EmailFilter):
         Returns:
             True if all keywords are found in subject, False otherwise
         """
-        subject_lower = email.subject.lower()
-        return all(kw in subject_lower for kw in self.keywords)
+        return _contains_all(email.subject_lower, self.keywords, self._automaton)
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit the keyword checks against the lowercased subject."""
+        return _emit_contains_all(f"{var}.subject_lower", self.keywords, self._automaton, ns)
 
 class BodyKeywordFilter(EmailFilter):
     """Filter emails by keywords in the body text.
@@ -111,6 +280,10 @@ class BodyKeywordFilter(EmailFilter):
         keywords: List of keywords that must all appear in body
     """
     
+    __slots__ = ('_automaton', 'keywords')
+    
+    cost = 4
+    
     def __init__(self, keywords: List[str]):
         """Initialize the body keyword filter.
         
@@ -118,6 +291,7 @@ class BodyKeywordFilter(EmailFilter):
             keywords: Keywords that must all appear in body (case-insensitive)
         """
         self.keywords = [kw.lower() for kw in keywords]
+        self._automaton = _build_automaton(self.keywords)
     
     def matches(self, email: EmailMetadata) -> bool:
         """Check if all keywords appear in the body.
@@ -128,8 +302,11 @@ class BodyKeywordFilter(EmailFilter):
         Returns:
             True if all keywords are found in body, False otherwise
         """
-        body_lower = email.body.lower()
-        return all(kw in body_lower for kw in self.keywords)
+        return _contains_all(email.body_lower, self.keywords, self._automaton)
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit the keyword checks against the lowercased body."""
+        return _emit_contains_all(f"{var}.body_lower", self.keywords, self._automaton, ns)
 
 class AttachmentPresenceFilter(EmailFilter):
     """Filter emails based on attachment presence.
@@ -141,6 +318,11 @@ class AttachmentPresenceFilter(EmailFilter):
         requires_attachments: True to require attachments, False to exclude them
     """
     
+    __slots__ = ('requires_attachments',)
+    
+    cost = 2
+    needs_body = False
+    
     def __init__(self, requires_attachments: bool):
         """Initialize the attachment presence filter.
         
@@ -165,3 +347,11 @@ class AttachmentPresenceFilter(EmailFilter):
         # This filter needs to be applied at the COM object level
         # where we have access to Attachments.Count
         return True
+    
+    def to_dasl(self) -> Optional[str]:
+        """Restrict on the store's has-attachment flag."""
+        return f"{DASL_HAS_ATTACHMENT} = {int(self.requires_attachments)}"
+    
+    def emit(self, var: str, ns: Dict[str, Any]) -> str:
+        """Emit a constant True expression (see matches())."""
+        return "True"
@@ -14,6 +14,24 @@ from outlook_exporter.utils.exceptions import OutlookConnectionError
 
 logger = logging.getLogger(__name__)
 
+# MAPI property holding an attachment's binary content
+PR_ATTACH_DATA_BIN = "http://schemas.microsoft.com/mapi/proptag/0x37010102"
+
+PR_TAG = "http://schemas.microsoft.com/mapi/proptag/"
+
+# Message properties read in one PropertyAccessor.GetProperties round-trip:
+# (object model property used as fallback, DASL property tag)
+MESSAGE_PROPS = (
+    ("Subject", PR_TAG + "0x0037001F"),
+    ("SenderEmailAddress", PR_TAG + "0x0C1F001F"),
+    ("SenderName", PR_TAG + "0x0C1A001F"),
+    ("ReceivedTime", PR_TAG + "0x0E060040"),
+    ("SentOn", PR_TAG + "0x00390040"),
+    ("To", PR_TAG + "0x0E04001F"),
+    ("CC", PR_TAG + "0x0E03001F"),
+)
+BODY_PROP = ("Body", PR_TAG + "0x1000001F")
+
 def safe_get_com_property(obj: Any, property_name: str, default: Any = None) -> Any:
     """Safely retrieve a property from a COM object.
     
@@ -64,6 +82,22 @@ def parse_com_datetime(com_date: Any) -> datetime:
     logger.warning(f"Could not parse COM datetime: {com_date}, using current time")
     return datetime.now()
 
+def _collection_count(collection: Any) -> int:
+    """Return the size of a COM collection (via .Count) or a plain sequence.
+    
+    Args:
+        collection: A COM collection or Python sequence
+        
+    Returns:
+        Number of items (0 if it cannot be determined)
+    """
+    try:
+        if hasattr(collection, 'Count'):
+            return int(collection.Count)
+        return len(collection)
+    except Exception:
+        return 0
+
 class OutlookMessageAdapter:
     """Adapter for Outlook MailItem COM objects.
     
@@ -74,6 +108,8 @@ class OutlookMessageAdapter:
         com_message: The underlying COM MailItem object
     """
     
+    __slots__ = ('com_message',)
+    
     def __init__(self, com_message: Any):
         """Initialize the message adapter.
         
@@ -82,33 +118,37 @@ class OutlookMessageAdapter:
         """
         self.com_message = com_message
     
-    def to_metadata(self) -> EmailMetadata:
+    def to_metadata(self, include_body: bool = True, include_html_body: bool = True) -> EmailMetadata:
         """Convert the COM message to an EmailMetadata domain model.
         
+        All plain properties are read with a single PropertyAccessor round-trip;
+        any the batch call cannot return are read individually.
+        
+        Args:
+            include_body: Whether to read the (potentially large) bodies. When
+                False, body and html_body are left empty and body_loaded is
+                False; call load_body() once they are needed
+            include_html_body: Whether to read HTMLBody, which is expensive for
+                Outlook to produce; html_body is left empty when False
+        
         Returns:
             EmailMetadata object with extracted information
         """
-        subject = safe_get_com_property(self.com_message, 'Subject', '') or ''
-        sender_email = safe_get_com_property(
-            self.com_message, 'SenderEmailAddress', ''
-        ) or 'unknown'
-        sender_name = safe_get_com_property(
-            self.com_message, 'SenderName', ''
-        ) or sender_email
-        
-        # Get datetime fields
-        received_raw = safe_get_com_property(
-            self.com_message, 'ReceivedTime', datetime.now()
-        )
-        received_time = parse_com_datetime(received_raw)
+        props = self._get_properties((*MESSAGE_PROPS, BODY_PROP) if include_body else MESSAGE_PROPS)
         
-        sent_raw = safe_get_com_property(self.com_message, 'SentOn', None)
+        subject = props['Subject'] or ''
+        sender_email = props['SenderEmailAddress'] or 'unknown'
+        sender_name = props['SenderName'] or sender_email
+        
+        received_raw = props['ReceivedTime']
+        received_time = parse_com_datetime(received_raw) if received_raw else datetime.now()
+        
+        sent_raw = props['SentOn']
         sent_time = parse_com_datetime(sent_raw) if sent_raw else None
         
-        to_recipients = safe_get_com_property(self.com_message, 'To', '') or ''
-        cc_recipients = safe_get_com_property(self.com_message, 'CC', '') or ''
-        body = safe_get_com_property(self.com_message, 'Body', '') or ''
-        html_body = safe_get_com_property(self.com_message, 'HTMLBody', '') or ''
+        html_body = ''
+        if include_body and include_html_body:
+            html_body = safe_get_com_property(self.com_message, 'HTMLBody', '') or ''
         
         return EmailMetadata(
             subject=subject,
@@ -116,12 +156,59 @@ class OutlookMessageAdapter:
             sender_name=sender_name,
             received_time=received_time,
             sent_time=sent_time,
-            to_recipients=to_recipients,
-            cc_recipients=cc_recipients,
-            body=body,
-            html_body=html_body
+            to_recipients=props['To'] or '',
+            cc_recipients=props['CC'] or '',
+            body=props.get('Body') or '',
+            html_body=html_body,
+            body_loaded=include_body
+        )
+    
+    def load_body(self, email: EmailMetadata) -> None:
+        """Fill in the bodies of metadata created with include_body=False.
+        
+        Args:
+            email: Metadata previously returned by to_metadata() for this message
+        """
+        if email.body_loaded:
+            return
+        email.set_body(
+            safe_get_com_property(self.com_message, 'Body', '') or '',
+            safe_get_com_property(self.com_message, 'HTMLBody', '') or '',
         )
     
+    def _get_properties(self, message_props: tuple = MESSAGE_PROPS) -> dict[str, Any]:
+        """Read message properties, batched through PropertyAccessor where possible.
+        
+        Args:
+            message_props: (object model property, DASL tag) pairs to read
+        
+        Returns:
+            Property values keyed by object model property name (None if unavailable)
+        """
+        try:
+            values = self.com_message.PropertyAccessor.GetProperties(
+                [tag for _, tag in message_props]
+            )
+        except Exception as e:
+            logger.debug(f"GetProperties failed, reading properties individually: {e}")
+            values = (None,) * len(message_props)
+        
+        props = {}
+        for (name, _), raw in zip(message_props, values, strict=True):
+            if isinstance(raw, datetime):
+                # PropertyAccessor returns UTC; the object model returns local time
+                value = raw.astimezone().replace(tzinfo=None) if raw.tzinfo is not None else raw
+            elif isinstance(raw, str):
+                value = raw
+            else:
+                # Missing value or MAPI error code for this property
+                value = safe_get_com_property(self.com_message, name, None)
+                if isinstance(value, datetime) and value.tzinfo is not None:
+                    # pywin32 labels local wall-clock time with a UTC tzinfo
+                    value = value.replace(tzinfo=None)
+            props[name] = value
+        return props
+    
     def get_attachment_count(self) -> int:
         """Get the number of attachments in the message.
         
@@ -131,19 +218,7 @@ class OutlookMessageAdapter:
         attachments = safe_get_com_property(self.com_message, 'Attachments', None)
         if attachments is None:
             return 0
-        
-        # COM collections have .Count property
-        if hasattr(attachments, 'Count'):
-            try:
-                return int(attachments.Count)
-            except Exception:
-                return 0
-        
-        # Fallback: try len()
-        try:
-            return len(attachments)
-        except Exception:
-            return 0
+        return _collection_count(attachments)
     
     def get_attachments(self) -> list[Any]:
         """Get all attachments from the message.
@@ -155,21 +230,20 @@ class OutlookMessageAdapter:
         if attachments is None:
             return []
         
-        result = []
-        count = self.get_attachment_count()
+        count = _collection_count(attachments)
+        # Resolve the access pattern once instead of probing for Item per index
+        if hasattr(attachments, 'Item'):
+            get_item = attachments.Item  # COM collections are 1-based
+        else:
+            def get_item(idx: int) -> Any:
+                return attachments[idx - 1]
         
-        # COM collections are 1-based
+        result = []
         for idx in range(1, count + 1):
             try:
-                if hasattr(attachments, 'Item'):
-                    # Use Item method for safe access
-                    result.append(attachments.Item(idx))
-                else:
-                    # Fallback to 0-based indexing
-                    result.append(attachments[idx - 1])
-            except (IndexError, Exception) as e:
+                result.append(get_item(idx))
+            except Exception as e:
                 logger.debug(f"Failed to access attachment {idx}/{count}: {e}")
-                continue
         
         return result
     
@@ -199,6 +273,8 @@ class OutlookAttachmentAdapter:
         com_attachment: The underlying COM Attachment object
     """
     
+    __slots__ = ('com_attachment',)
+    
     def __init__(self, com_attachment: Any):
         """Initialize the attachment adapter.
         
@@ -232,6 +308,26 @@ class OutlookAttachmentAdapter:
             position=position
         )
     
+    def read_content(self, max_size: Optional[int] = None) -> Optional[bytes]:
+        """Read the attachment's content into memory via PR_ATTACH_DATA_BIN.
+        
+        Args:
+            max_size: Skip attachments whose reported size exceeds this many bytes
+            
+        Returns:
+            The attachment bytes, or None if the attachment is too large or the
+            property is unavailable (e.g. embedded items or OLE objects)
+        """
+        if max_size is not None:
+            size = safe_get_com_property(self.com_attachment, 'Size', 0) or 0
+            if size > max_size:
+                return None
+        try:
+            return bytes(self.com_attachment.PropertyAccessor.GetProperty(PR_ATTACH_DATA_BIN))
+        except Exception as e:
+            logger.debug(f"PR_ATTACH_DATA_BIN unavailable: {e}")
+            return None
+    
     def save_to_file(self, file_path: str) -> None:
         """Save the attachment to a file.
         
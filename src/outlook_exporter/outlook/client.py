@@ -14,6 +14,7 @@ except ImportError:
     win32com = None
     pythoncom = None
 
+from outlook_exporter.filters.base import EmailFilter
 from outlook_exporter.utils.exceptions import (
     OutlookConnectionError,
     FolderNotFoundError
@@ -24,6 +25,9 @@ logger = logging.getLogger(__name__)
 # Outlook constants
 OUTLOOK_INBOX_ID = 6
 
+# Give up on a folder after this many consecutive unreadable items
+MAX_CONSECUTIVE_ITEM_ERRORS = 10
+
 class OutlookClient:
     """High-level client for Outlook COM interactions.
     
@@ -33,6 +37,8 @@ class OutlookClient:
     Attributes:
         namespace: The Outlook MAPI namespace object
         _com_initialized: Whether COM has been initialized
+        _folder_cache: Resolved folders by path components below the Inbox
+            (valid for the current connection only)
     """
     
     def __init__(self):
@@ -49,6 +55,7 @@ class OutlookClient:
         
         self._com_initialized = False
         self.namespace: Optional[Any] = None
+        self._folder_cache: dict[tuple[str, ...], Any] = {}
     
     def __enter__(self):
         """Context manager entry - initializes COM and connects to Outlook."""
@@ -69,8 +76,9 @@ class OutlookClient:
             pythoncom.CoInitialize()
             self._com_initialized = True
             
-            outlook = win32com.client.Dispatch("Outlook.Application")
+            outlook = self._dispatch_application()
             self.namespace = outlook.GetNamespace("MAPI")
+            self._folder_cache.clear()
             
             logger.info("Successfully connected to Outlook")
         
@@ -83,6 +91,23 @@ class OutlookClient:
                 f"Failed to connect to Outlook: {e}"
             ) from e
     
+    @staticmethod
+    def _dispatch_application() -> Any:
+        """Dispatch Outlook.Application, early-bound when possible.
+        
+        Early-bound (makepy) proxies call properties by known DISPID instead of
+        resolving each name through IDispatch::GetIDsOfNames first.
+        
+        Returns:
+            The Outlook Application COM object
+        """
+        try:
+            return win32com.client.gencache.EnsureDispatch("Outlook.Application")
+        except Exception as e:
+            # e.g. a stale or read-only gen_py cache
+            logger.debug(f"Early binding unavailable, using late-bound dispatch: {e}")
+            return win32com.client.Dispatch("Outlook.Application")
+    
     def disconnect(self) -> None:
         """Disconnect from Outlook and cleanup COM resources."""
         if self._com_initialized:
@@ -93,12 +118,15 @@ class OutlookClient:
             finally:
                 self._com_initialized = False
                 self.namespace = None
+                # Folder objects belong to the old session
+                self._folder_cache.clear()
     
     def get_folder(self, folder_path: Optional[str] = None) -> Any:
         """Get an Outlook folder by path.
         
         If no path is specified, returns the default Inbox folder.
-        Path components are separated by '/' or '\\'.
+        Path components are separated by '/' or '\\'. Resolved folders,
+        including every intermediate one, are cached for the connection.
         
         Args:
             folder_path: Folder path (e.g., 'Inbox/SubFolder') or None for Inbox
@@ -117,19 +145,28 @@ class OutlookClient:
         if self.namespace is None:
             raise OutlookConnectionError("Not connected to Outlook")
         
+        # Skip empty parts and 'Inbox' (we start from Inbox)
+        parts = tuple(
+            part for part in (folder_path or '').replace('\\', '/').split('/')
+            if part and part.lower() != 'inbox'
+        )
+        
         try:
             # Get default Inbox
-            folder = self.namespace.GetDefaultFolder(OUTLOOK_INBOX_ID)
+            folder = self._folder_cache.get(())
+            if folder is None:
+                folder = self.namespace.GetDefaultFolder(OUTLOOK_INBOX_ID)
+                self._folder_cache[()] = folder
             
-            if not folder_path:
+            if not parts:
                 return folder
             
-            # Navigate to subfolder
-            parts = folder_path.replace('\\', '/').split('/')
-            
-            for part in parts:
-                # Skip empty parts and 'Inbox' (we start from Inbox)
-                if not part or part.lower() == 'inbox':
+            # Navigate to subfolder, reusing any cached prefix of the path
+            for depth, part in enumerate(parts, start=1):
+                key = parts[:depth]
+                cached = self._folder_cache.get(key)
+                if cached is not None:
+                    folder = cached
                     continue
                 
                 try:
@@ -138,6 +175,7 @@ class OutlookClient:
                     raise FolderNotFoundError(
                         f"Folder '{part}' not found in path '{folder_path}'"
                     )
+                self._folder_cache[key] = folder
             
             logger.info(f"Opened folder: {folder_path or 'Inbox'}")
             return folder
@@ -153,17 +191,23 @@ class OutlookClient:
         self,
         folder: Any,
         batch_size: int = 200,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        *,
+        email_filter: Optional[EmailFilter] = None
     ) -> Iterator[Any]:
-        """Iterate through messages in a folder with batching.
+        """Iterate through messages in a folder, newest first.
         
-        Uses safe iteration to handle COM collection issues. Processes messages
-        in batches to avoid loading the entire collection into memory.
+        Walks the collection with the GetFirst/GetNext cursor, which yields each
+        message once; Item(i) makes Outlook seek to index i on every call.
+        Items that cannot be read are logged and skipped.
         
         Args:
             folder: An Outlook Folder COM object
-            batch_size: Number of messages to process per batch
+            batch_size: Deprecated and ignored; messages are streamed one at a time
             limit: Maximum number of messages to return (None for unlimited)
+            email_filter: Filter whose DASL translation (see EmailFilter.to_dasl)
+                restricts the folder inside the MAPI store. Yielded messages
+                must still be checked with its matches()
             
         Yields:
             Outlook MailItem COM objects
@@ -174,40 +218,42 @@ class OutlookClient:
             ...     print(message.Subject)
         """
         try:
+            # Keep this reference: the GetFirst/GetNext cursor lives on it
             items = folder.Items
-            total = items.Count
-            processed = 0
-            
-            logger.info(f"Found {total} messages in folder")
-            
-            while processed < total:
-                if limit and processed >= limit:
-                    logger.info(f"Reached message limit of {limit}")
-                    break
-                
-                end_index = min(processed + batch_size, total)
-                if limit:
-                    end_index = min(end_index, limit)
-                
-                # COM collections are 1-based
-                for i in range(processed + 1, end_index + 1):
-                    try:
-                        # Use Item method for safe 1-based access
-                        if hasattr(items, 'Item'):
-                            yield items.Item(i)
-                        else:
-                            # Fallback to direct indexing
-                            yield items[i]
-                    except (IndexError, Exception) as e:
-                        logger.debug(f"Failed to access message {i}/{total}: {e}")
-                        continue
-                
-                processed = end_index
-            
-            logger.info(f"Processed {processed} messages")
-        
+            query = email_filter.to_dasl() if email_filter else None
+            if query:
+                logger.debug(f"Restricting folder items: {query}")
+                items = items.Restrict("@SQL=" + query)
+            logger.info(f"Found {items.Count} messages in folder")
+            items.Sort("[ReceivedTime]", True)
+            message = items.GetFirst()
         except Exception as e:
             logger.error(f"Error iterating messages: {e}")
             raise OutlookConnectionError(
                 f"Failed to iterate messages: {e}"
             ) from e
+        
+        processed = 0
+        errors = 0
+        while message is not None:
+            yield message
+            processed += 1
+            if limit and processed >= limit:
+                logger.info(f"Reached message limit of {limit}")
+                break
+            message = None
+            while True:
+                try:
+                    message = items.GetNext()
+                    errors = 0
+                    break
+                except Exception as e:
+                    errors += 1
+                    logger.debug(f"Failed to access message after {processed}: {e}")
+                    if errors >= MAX_CONSECUTIVE_ITEM_ERRORS:
+                        logger.warning(
+                            f"Stopped after {errors} consecutive unreadable messages"
+                        )
+                        break
+        
+        logger.info(f"Processed {processed} messages")
@@ -4,15 +4,21 @@ This module provides functions for safely creating file system paths,
 handling Windows path length limitations, and sanitizing user input.
 """
 
+import functools
 import hashlib
-import re
+import threading
 from pathlib import Path
 
+# Characters that are invalid in Windows path components (\ / : * ? " < > | and NUL)
+_INVALID_PATH_CHARS = '\\/:*?"<>|\0'
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_for_filesystem(value: str, max_length: int = 255) -> str:
     """Sanitize a string for use as a file or directory name.
     
     Removes or replaces characters that are invalid in Windows paths,
     handles trailing spaces and dots, and enforces length limits.
+    Results are memoized, since exports repeat the same senders and subjects.
     
     Args:
         value: The string to sanitize
@@ -30,9 +36,12 @@ def sanitize_for_filesystem(value: str, max_length: int = 255) -> str:
     # Remove leading/trailing whitespace
     value = value.strip()
     
-    # Replace invalid Windows path characters with underscores
-    # Invalid chars: \ / : * ? " < > |
-    value = re.sub(r'[\\/:*?"<>|]', '_', value)
+    # Replace invalid Windows path characters with underscores. One C-level
+    # scan per character is several times faster than str.translate, which
+    # does a dict lookup for every character of the input
+    for char in _INVALID_PATH_CHARS:
+        if char in value:
+            value = value.replace(char, '_')
     
     # Remove trailing spaces and dots (Windows restriction)
     value = value.rstrip('. ')
@@ -85,7 +94,7 @@ def create_email_folder_path(
         
         if len(str(target_dir)) > 200:
             # Strategy 2: Use hash of subject
-            subject_hash = hashlib.md5(subject.encode('utf-8')).hexdigest()[:8]
+            subject_hash = hashlib.md5(subject.encode('utf-8'), usedforsecurity=False).hexdigest()[:8]
             target_dir = base_dir / sender / f"subj_{subject_hash}" / date_str
             
             if len(str(target_dir)) > 200:
@@ -121,6 +130,47 @@ def ensure_unique_path(path: Path) -> Path:
             return new_path
         counter += 1
 
+class UniquePathAllocator:
+    """Hands out unique file paths like ensure_unique_path, without a stat per candidate.
+    
+    Each directory is listed once; later collisions are resolved against that
+    cached set of names, and every allocated name is reserved in it. Files
+    created or removed in a directory by other processes after its first
+    listing are not noticed.
+    """
+    
+    def __init__(self):
+        """Initialize an allocator with an empty directory cache."""
+        self._dir_cache: dict[Path, set[str]] = {}
+        self._lock = threading.Lock()
+    
+    def allocate(self, path: Path) -> Path:
+        """Return a unique path for a new file and reserve it.
+        
+        Args:
+            path: The desired file path
+            
+        Returns:
+            The path itself, or one with "_1", "_2", etc. appended to the stem
+        """
+        directory = path.parent
+        with self._lock:
+            names = self._dir_cache.get(directory)
+            if names is None:
+                try:
+                    names = {entry.name for entry in directory.iterdir()}
+                except FileNotFoundError:
+                    names = set()
+                self._dir_cache[directory] = names
+            
+            candidate = path.name
+            counter = 1
+            while candidate in names:
+                candidate = f"{path.stem}_{counter}{path.suffix}"
+                counter += 1
+            names.add(candidate)
+        return directory / candidate
+
 def get_relative_path(from_path: Path, to_path: Path) -> str:
     """Get a relative path from one file to another.
     
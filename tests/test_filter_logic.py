@@ -1,13 +1,18 @@
-"""Minimal tests for message_matches logic using a fake message object.
+"""Minimal tests for main.py filtering and file helpers using fake message objects.
 
 These tests do not interact with Outlook; they verify pure filtering logic
-based on attributes required by message_matches.
+based on the MsgView snapshot built by fetch_view, plus the path/write helpers.
 """
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 import argparse
 
+import pytest
+
+# main imports pywin32 at module level; report these tests as skipped without it
+pytest.importorskip("win32com.client", reason="main.py requires pywin32")
+
 import main  # type: ignore
 
 
@@ -44,53 +49,202 @@ def build_args(**overrides):
     ns = argparse.Namespace()
     for k, v in base.items():
         setattr(ns, k, v)
+    main.prepare_filters(ns)
     return ns
 
 
 def test_subject_keyword_match():
     args = build_args(subject_keyword=["Invoice"])
     msg = make_message(subject="Quarterly Invoice")
-    assert main.message_matches(msg, args) is True
+    assert main.message_matches(main.fetch_view(msg), args) is True
 
 
 def test_subject_keyword_miss():
     args = build_args(subject_keyword=["Invoice"])
     msg = make_message(subject="Report")
-    assert main.message_matches(msg, args) is False
+    assert main.message_matches(main.fetch_view(msg), args) is False
 
 
 def test_body_keyword_all_required():
     args = build_args(body_keyword=["urgent", "review"])
     msg = make_message(body="Please urgent action and review this")
-    assert main.message_matches(msg, args) is True
+    assert main.message_matches(main.fetch_view(msg), args) is True
 
 
 def test_body_keyword_missing_one():
     args = build_args(body_keyword=["urgent", "review"])
     msg = make_message(body="Please urgent action")
-    assert main.message_matches(msg, args) is False
+    assert main.message_matches(main.fetch_view(msg), args) is False
 
 
 def test_sender_filter():
     args = build_args(sender=["sender@example.com"])  # exact match lowercased
     msg = make_message(sender="SENDER@example.com")
-    assert main.message_matches(msg, args) is True
+    assert main.message_matches(main.fetch_view(msg), args) is True
 
 
 def test_date_range_excludes_old():
     today = datetime.now().strftime("%Y-%m-%d")
     args = build_args(start_date=today)
     msg = make_message(days_offset=-2)
-    assert main.message_matches(msg, args) is False
+    assert main.message_matches(main.fetch_view(msg), args) is False
 
 
 def test_with_attachments_only():
     args = build_args(with_attachments=True)
     msg = make_message(attachments=2)
-    assert main.message_matches(msg, args) is True
+    assert main.message_matches(main.fetch_view(msg), args) is True
 
 
 def test_without_attachments_only():
     args = build_args(without_attachments=True)
     msg = make_message(attachments=0)
-    assert main.message_matches(msg, args) is True
+    assert main.message_matches(main.fetch_view(msg), args) is True
+
+
+class FakePropertyAccessor:
+    def __init__(self, values):
+        self._values = values
+
+    def GetProperties(self, tags):
+        return tuple(self._values.get(tag, -2147221233) for tag in tags)  # MAPI_E_NOT_FOUND
+
+
+def test_fetch_view_uses_batched_properties():
+    received = datetime(2024, 1, 15, 9, 30, tzinfo=UTC)
+    msg = make_message(subject="Fallback subject")
+    msg.PropertyAccessor = FakePropertyAccessor({
+        main.PR_TAG + "0x0037001F": "Batched subject",
+        main.PR_TAG + "0x0C1F001F": "batch@example.com",
+        main.PR_TAG + "0x0E060040": received,
+        main.PR_TAG + "0x0E1B000B": True,
+    })
+    view = main.fetch_view(msg, with_body=False)
+    assert view.subject == "Batched subject"
+    assert view.sender_email == "batch@example.com"
+    assert view.sender_name == "batch@example.com"
+    assert view.received == received.astimezone().replace(tzinfo=None)
+    assert view.has_attachments is True
+    assert view.body == ""
+
+
+def test_fetch_view_falls_back_per_property():
+    msg = make_message(body="Body text", attachments=1)
+    msg.PropertyAccessor = FakePropertyAccessor({})
+    view = main.fetch_view(msg)
+    assert view.subject == "Subject"
+    assert view.body == "Body text"
+    assert view.received == msg.ReceivedTime
+    assert view.has_attachments is True
+
+
+def test_build_restriction_none_without_store_filters():
+    args = build_args(subject_keyword=["Invoice"])
+    assert main.build_restriction(args) is None
+
+
+def test_build_restriction_combines_clauses():
+    args = build_args(start_date="2024-01-01", sender=["a@example.com", "o'brien@example.com"], with_attachments=True)
+    query = main.build_restriction(args)
+    assert query.startswith("@SQL=")
+    assert '"urn:schemas:httpmail:datereceived" >= ' in query
+    assert "= 'o''brien@example.com'" in query
+    assert '"urn:schemas:httpmail:hasattachment" = 1' in query
+    assert query.count(" AND ") == 2
+
+
+def test_unique_path_uses_cached_listing(tmp_path):
+    (tmp_path / "report.pdf").write_bytes(b"x")
+    first = main.unique_path(tmp_path, "report.pdf")
+    second = main.unique_path(tmp_path, "report.pdf")
+    assert first.name == "report_1.pdf"
+    assert second.name == "report_2.pdf"
+    assert main.unique_path(tmp_path, "other.txt").name == "other.txt"
+
+
+def test_unique_path_probes_files_created_after_listing(tmp_path):
+    main.reset_path_cache()
+    assert main.unique_path(tmp_path, "a.txt").name == "a.txt"
+    (tmp_path / "b.txt").write_bytes(b"x")  # Appears after the directory was listed
+    assert main.unique_path(tmp_path, "b.txt").name == "b_1.txt"
+    with main._save_lock:
+        main.release_path(tmp_path / "a.txt")
+    assert main.unique_path(tmp_path, "a.txt").name == "a.txt"
+    main.reset_path_cache()
+    assert tmp_path not in main._dir_cache
+
+
+def test_write_new_file_refuses_existing(tmp_path):
+    target = tmp_path / "data.bin"
+    main.write_new_file(target, b"payload")
+    assert target.read_bytes() == b"payload"
+    with pytest.raises(FileExistsError):
+        main.write_new_file(target, b"other")
+
+
+def test_is_trivial_html():
+    assert main.is_trivial_html('<html><body><p class="x">Hello there</p></body></html>')
+    assert main.is_trivial_html('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"></head>\n<body>\n<div>Hi</div>\n</body></html>\n')
+    assert not main.is_trivial_html('<html><body><p>Hello <b>there</b></p></body></html>')
+    assert not main.is_trivial_html('<html><body><p>One</p><p>Two</p></body></html>')
+
+
+class FakeAttachmentCollection:
+    def __init__(self, names, broken=()):
+        self.names = names
+        self.broken = set(broken)
+        self.count_reads = 0
+
+    @property
+    def Count(self):
+        self.count_reads += 1
+        return len(self.names)
+
+    def Item(self, idx):
+        if idx in self.broken:
+            raise RuntimeError("COM error")
+        return self.names[idx - 1]
+
+
+def test_iter_attachments_com_collection():
+    attachments = FakeAttachmentCollection(["a", "b", "c"], broken={2})
+    assert list(main.iter_attachments(attachments)) == ["a", "c"]
+    assert attachments.count_reads == 1
+    assert list(main.iter_attachments(["x", "y"])) == ["x", "y"]
+    assert main.attachment_count(()) == 0
+
+
+def test_parse_date():
+    assert main.parse_date("2024-03-05") == datetime(2024, 3, 5)
+    assert main.parse_date("2024-3-5") == datetime(2024, 3, 5)
+    assert main.parse_date("") is None
+    with pytest.raises(ValueError):
+        main.parse_date("05/03/2024")
+    # ISO week dates are accepted by fromisoformat but are not YYYY-MM-DD
+    with pytest.raises(ValueError):
+        main.parse_date("2024-W01-1")
+
+
+class FakeItems:
+    """Items collection exposing only the GetFirst/GetNext cursor."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.pos = 0
+
+    def GetFirst(self):
+        self.pos = 0
+        return self.GetNext()
+
+    def GetNext(self):
+        if self.pos >= len(self.messages):
+            return None
+        self.pos += 1
+        return self.messages[self.pos - 1]
+
+
+def test_iterate_messages_uses_cursor():
+    assert list(main.iterate_messages(FakeItems(["m1", "m2", "m3"]), None)) == ["m1", "m2", "m3"]
+    assert list(main.iterate_messages(FakeItems(["m1", "m2", "m3"]), 2)) == ["m1", "m2"]
+    assert list(main.iterate_messages(FakeItems([]), None)) == []
+    assert list(main.iterate_messages(["a", "b"], 1)) == ["a"]
@@ -0,0 +1,196 @@
+"""Unit tests for duplicate detection."""
+
+import hashlib
+from pathlib import Path
+import pytest
+
+from outlook_exporter.core import duplicates
+from outlook_exporter.core.duplicates import DuplicateTracker, MMAP_THRESHOLD
+from outlook_exporter.utils.exceptions import DuplicateDetectionError
+
+class TestComputeFileHash:
+    """Tests for DuplicateTracker file and data digests."""
+
+    def test_matches_hashlib(self, tmp_path: Path):
+        """Test that the digest matches a one-shot hashlib digest."""
+        data = bytes(range(256)) * 10
+        target = tmp_path / "data.bin"
+        target.write_bytes(data)
+        tracker = DuplicateTracker(hash_algorithm="sha256")
+        assert tracker.compute_file_digest(target) == hashlib.sha256(data).digest()
+
+    def test_memory_mapped_file(self, tmp_path: Path):
+        """Test files above the mmap threshold are hashed completely."""
+        data = b"ab" * MMAP_THRESHOLD + b"tail"
+        target = tmp_path / "large.bin"
+        target.write_bytes(data)
+        tracker = DuplicateTracker(hash_algorithm="md5")
+        assert tracker.compute_file_digest(target) == hashlib.md5(data).digest()
+
+    def test_empty_file(self, tmp_path: Path):
+        """Test hashing an empty file."""
+        target = tmp_path / "empty.bin"
+        target.write_bytes(b"")
+        tracker = DuplicateTracker(hash_algorithm="sha256")
+        assert tracker.compute_file_hash_hex(target) == hashlib.sha256(b"").hexdigest()
+
+    def test_unmappable_file_falls_back_to_streaming(self, tmp_path: Path, monkeypatch):
+        """Test hashing still works when the file cannot be memory-mapped."""
+        data = b"x" * (4 * MMAP_THRESHOLD + 17)
+        target = tmp_path / "share.bin"
+        target.write_bytes(data)
+
+        def refuse(*args, **kwargs):
+            raise OSError("mapping not supported")
+
+        monkeypatch.setattr(duplicates.mmap, "mmap", refuse)
+        tracker = DuplicateTracker(hash_algorithm="sha256")
+        assert tracker.compute_file_digest(target) == hashlib.sha256(data).digest()
+
+    def test_data_hash_matches_file_hash(self, tmp_path: Path):
+        """Test in-memory and on-disk hashing agree."""
+        data = b"attachment payload"
+        target = tmp_path / "payload.bin"
+        target.write_bytes(data)
+        tracker = DuplicateTracker()
+        assert tracker.compute_data_digest(data) == tracker.compute_file_digest(target)
+
+    def test_batch_digests(self, tmp_path: Path):
+        """Test hashing several files at once matches hashing them one by one."""
+        paths = []
+        for i in range(5):
+            target = tmp_path / f"file{i}.bin"
+            target.write_bytes(bytes([i]) * (MMAP_THRESHOLD + i))
+            paths.append(target)
+        tracker = DuplicateTracker()
+        digests = tracker.compute_file_digests(paths, max_workers=3)
+        assert digests == {path: tracker.compute_file_digest(path) for path in paths}
+        assert tracker.compute_file_digests(paths[:1]) == {paths[0]: tracker.compute_file_digest(paths[0])}
+
+
+class TestVerifySet:
+    """Tests for byte-level verification of duplicate sets."""
+
+    def test_identical_and_different(self, tmp_path: Path):
+        """Test identical files verify and a single differing byte does not."""
+        data = b"z" * (3 * duplicates.VERIFY_CHUNK_SIZE // 2)
+        a, b, c = (tmp_path / name for name in ("a", "b", "c"))
+        a.write_bytes(data)
+        b.write_bytes(data)
+        c.write_bytes(data[:-1] + b"y")
+        tracker = DuplicateTracker()
+        assert tracker.verify_set([a, b])
+        assert not tracker.verify_set([a, b, c])
+
+    def test_size_mismatch_and_empty(self, tmp_path: Path):
+        """Test size differences short-circuit and empty files verify."""
+        a, b, e1, e2 = (tmp_path / name for name in ("a", "b", "e1", "e2"))
+        a.write_bytes(b"abc")
+        b.write_bytes(b"abcd")
+        e1.write_bytes(b"")
+        e2.write_bytes(b"")
+        tracker = DuplicateTracker()
+        assert not tracker.verify_set([a, b])
+        assert tracker.verify_set([e1, e2])
+        assert tracker.verify_set([a])
+
+
+class TestHashAlgorithm:
+    """Tests for hash algorithm selection."""
+
+    def test_unknown_algorithm(self):
+        """Test that unknown algorithms are rejected."""
+        with pytest.raises(DuplicateDetectionError):
+            DuplicateTracker(hash_algorithm="not-a-hash")
+
+    def test_blake3_requires_package(self, monkeypatch):
+        """Test that blake3 is only offered when the package is installed."""
+        monkeypatch.setattr(duplicates, "blake3", None)
+        assert "blake3" not in duplicates.available_algorithms()
+        with pytest.raises(DuplicateDetectionError):
+            DuplicateTracker(hash_algorithm="blake3")
+
+
+class TestRegistry:
+    """Tests for duplicate registration keyed by raw digest."""
+
+    def test_register_and_detect(self):
+        """Test registering files and detecting duplicates."""
+        tracker = DuplicateTracker()
+        digest = tracker.compute_data_digest(b"same")
+        assert not tracker.is_duplicate(digest)
+        tracker.register_file(Path("a.txt"), digest)
+        tracker.register_file(Path("dup/a.txt"), digest)
+        assert tracker.is_duplicate(digest)
+        assert tracker.get_original_locations(digest) == [Path("a.txt"), Path("dup/a.txt")]
+        assert tracker.get_statistics() == {"unique_files": 1, "total_files": 2, "duplicate_files": 1}
+
+    def test_bulk_register(self, tmp_path: Path):
+        """Test rebuilding the registry from existing files."""
+        (tmp_path / "a.txt").write_bytes(b"same")
+        (tmp_path / "b.txt").write_bytes(b"same")
+        (tmp_path / "c.txt").write_bytes(b"other")
+        paths = [tmp_path / name for name in ("a.txt", "b.txt", "c.txt", "missing.txt")]
+        tracker = DuplicateTracker()
+        assert tracker.bulk_register(paths, max_inflight=2) == 3
+        digest = tracker.compute_data_digest(b"same")
+        assert tracker.get_original_locations(digest) == paths[:2]
+        assert tracker.get_statistics()["duplicate_files"] == 1
+
+
+class TestPersistence:
+    """Tests for saving and loading the hash registry."""
+
+    def test_round_trip(self, tmp_path: Path):
+        """Test a saved registry is restored by load()."""
+        (tmp_path / "a.txt").write_bytes(b"content")
+        tracker = DuplicateTracker()
+        digest = tracker.compute_data_digest(b"content")
+        tracker.register_file(tmp_path / "a.txt", digest)
+        cache = tmp_path / duplicates.CACHE_FILENAME
+        tracker.save(cache)
+
+        restored = DuplicateTracker.load(cache)
+        assert restored.is_duplicate(digest)
+        assert restored.get_original_locations(digest) == [tmp_path / "a.txt"]
+        assert restored.get_statistics()["total_files"] == 1
+        restored.clear()
+        assert restored.get_statistics() == {"unique_files": 0, "total_files": 0, "duplicate_files": 0}
+
+    def test_algorithm_mismatch_ignored(self, tmp_path: Path):
+        """Test a cache built with another algorithm is not reused."""
+        tracker = DuplicateTracker(hash_algorithm="md5")
+        tracker.register_file(tmp_path / "a.txt", tracker.compute_data_digest(b"x"))
+        cache = tmp_path / duplicates.CACHE_FILENAME
+        tracker.save(cache)
+        assert DuplicateTracker.load(cache, hash_algorithm="sha256").seen_hashes == {}
+
+    def test_default_is_truncated_blake2b(self):
+        """Test the default digest is BLAKE2b cut to 16 bytes, as the CLI computes it."""
+        tracker = DuplicateTracker()
+        assert tracker.hash_algorithm == duplicates.DEFAULT_HASH_ALGORITHM == "blake2b"
+        assert tracker.compute_data_digest(b"x") == hashlib.blake2b(b"x", digest_size=16).digest()
+        assert duplicates.new_hasher("blake2b", b"x").digest() == tracker.compute_data_digest(b"x")
+
+    def test_missing_or_corrupt_cache(self, tmp_path: Path):
+        """Test missing and unreadable caches yield an empty tracker."""
+        cache = tmp_path / duplicates.CACHE_FILENAME
+        assert DuplicateTracker.load(cache).seen_hashes == {}
+        cache.write_text("{not json", encoding="utf-8")
+        assert DuplicateTracker.load(cache).seen_hashes == {}
+    
+    def test_missing_files_dropped(self, tmp_path: Path):
+        """Test entries for exported files that were since deleted are not restored."""
+        (tmp_path / "kept.txt").write_bytes(b"kept")
+        tracker = DuplicateTracker()
+        kept = tracker.compute_data_digest(b"kept")
+        gone = tracker.compute_data_digest(b"gone")
+        tracker.register_file(tmp_path / "kept.txt", kept)
+        tracker.register_file(tmp_path / "gone.txt", gone)
+        cache = tmp_path / duplicates.CACHE_FILENAME
+        tracker.save(cache)
+        
+        restored = DuplicateTracker.load(cache)
+        assert restored.is_duplicate(kept)
+        assert not restored.is_duplicate(gone)
+        assert restored.get_statistics()["total_files"] == 1
@@ -0,0 +1,160 @@
+"""Unit tests for exporters."""
+
+from pathlib import Path
+
+from outlook_exporter.core.duplicates import CACHE_FILENAME, DuplicateTracker
+from outlook_exporter.core.models import ExportConfig, ExportResult
+from outlook_exporter.exporters.base import ExporterFactory
+from outlook_exporter.utils.exceptions import DuplicateDetectionError
+
+
+class FakePropertyAccessor:
+    """PropertyAccessor stand-in serving PR_ATTACH_DATA_BIN."""
+    
+    def __init__(self, data):
+        self.data = data
+    
+    def GetProperty(self, tag):
+        if self.data is None:
+            raise RuntimeError("property unavailable")
+        return self.data
+
+
+class FakeAttachment:
+    """Attachment stand-in; in_memory=False forces the SaveAsFile temp-file path."""
+    
+    def __init__(self, filename: str, data: bytes, in_memory: bool = True):
+        self.FileName = filename
+        self.Position = 1
+        self.Type = 1
+        self.Size = len(data)
+        self._data = data
+        self.PropertyAccessor = FakePropertyAccessor(data if in_memory else None)
+    
+    def SaveAsFile(self, path: str):
+        Path(path).write_bytes(self._data)
+
+
+class FakeAttachments:
+    """1-based Attachments collection stand-in."""
+    
+    def __init__(self, attachments):
+        self._attachments = attachments
+        self.Count = len(attachments)
+    
+    def Item(self, index: int):
+        return self._attachments[index - 1]
+
+
+class FakeMessage:
+    """Message stand-in exposing only an Attachments collection."""
+    
+    def __init__(self, attachments):
+        self.Attachments = FakeAttachments(attachments)
+
+
+class TestExporterLifecycle:
+    """Tests for exporter setup and teardown."""
+    
+    def test_context_manager_persists_registry(self, tmp_path: Path):
+        """Test leaving the with block saves the duplicate registry."""
+        config = ExportConfig(output_dir=tmp_path)
+        (tmp_path / "a.txt").write_bytes(b"a")
+        with ExporterFactory.create_exporter(config, "attachments") as exporter:
+            tracker = exporter.duplicate_tracker
+            tracker.register_file(tmp_path / "a.txt", tracker.compute_data_digest(b"a"))
+        
+        restored = DuplicateTracker.load(tmp_path / CACHE_FILENAME, hash_algorithm=config.hash_algorithm)
+        assert restored.get_original_locations(tracker.compute_data_digest(b"a")) == [tmp_path / "a.txt"]
+    
+    def test_registry_loaded_on_first_use(self, tmp_path: Path):
+        """Test exporters that never check duplicates do not load or write the registry."""
+        config = ExportConfig(output_dir=tmp_path)
+        with ExporterFactory.create_exporter(config, "msg"):
+            pass
+        
+        assert config.duplicate_tracker is None
+        assert not (tmp_path / CACHE_FILENAME).exists()
+
+
+class TestAttachmentPipeline:
+    """Tests for fetching, hashing and storing a message's attachments."""
+    
+    def _save_all(self, exporter, attachments, folder: Path):
+        result = ExportResult()
+        saved = list(exporter._iter_saved_attachments(FakeMessage(attachments), folder, None, result))
+        return saved, result
+    
+    def test_saves_in_order(self, tmp_path: Path):
+        """Test attachments are yielded in collection order, whichever path they take."""
+        attachments = [
+            FakeAttachment("a.txt", b"a"),
+            FakeAttachment("b.bin", b"b", in_memory=False),
+            FakeAttachment("c.txt", b"c"),
+        ]
+        with ExporterFactory.create_exporter(ExportConfig(output_dir=tmp_path), "attachments") as exporter:
+            saved, result = self._save_all(exporter, attachments, tmp_path)
+        
+        assert [a.filename for a in saved] == ["a.txt", "b.bin", "c.txt"]
+        assert [a.path.read_bytes() for a in saved] == [b"a", b"b", b"c"]
+        assert not list(tmp_path.glob("*.tmp"))
+        assert result.errors == []
+    
+    def test_duplicates_go_to_subfolder(self, tmp_path: Path):
+        """Test repeated content is stored in the duplicates subfolder."""
+        attachments = [
+            FakeAttachment("report.pdf", b"same"),
+            FakeAttachment("report.pdf", b"same", in_memory=False),
+        ]
+        config = ExportConfig(output_dir=tmp_path)
+        with ExporterFactory.create_exporter(config, "attachments") as exporter:
+            saved, _ = self._save_all(exporter, attachments, tmp_path)
+        
+        assert [a.path for a in saved] == [
+            tmp_path / "report.pdf",
+            tmp_path / config.duplicates_subfolder / "report.pdf",
+        ]
+        assert saved[0].content_hash == saved[1].content_hash
+    
+    def test_hash_failure_skips_attachment_and_removes_temp(self, tmp_path: Path, monkeypatch):
+        """Test an attachment that cannot be hashed is skipped without leaking its temp file."""
+        attachments = [
+            FakeAttachment("a.txt", b"a"),
+            FakeAttachment("broken.bin", b"x", in_memory=False),
+            FakeAttachment("c.txt", b"c"),
+        ]
+        with ExporterFactory.create_exporter(ExportConfig(output_dir=tmp_path), "attachments") as exporter:
+            def fail(file_path):
+                raise DuplicateDetectionError(f"cannot read {file_path}")
+            
+            monkeypatch.setattr(exporter.duplicate_tracker, "compute_file_digest", fail)
+            saved, _ = self._save_all(exporter, attachments, tmp_path)
+        
+        assert [a.filename for a in saved] == ["a.txt", "c.txt"]
+        assert not (tmp_path / "broken.bin").exists()
+        assert not list(tmp_path.glob("*.tmp"))
+    
+    def test_abandoned_iteration_removes_pending_temp(self, tmp_path: Path):
+        """Test closing the generator early removes the temp file still being hashed."""
+        attachments = [
+            FakeAttachment("a.bin", b"a", in_memory=False),
+            FakeAttachment("b.bin", b"b", in_memory=False),
+        ]
+        with ExporterFactory.create_exporter(ExportConfig(output_dir=tmp_path), "attachments") as exporter:
+            saved = exporter._iter_saved_attachments(FakeMessage(attachments), tmp_path, None, ExportResult())
+            assert next(saved).filename == "a.bin"
+            saved.close()
+        
+        assert not (tmp_path / "b.bin").exists()
+        assert not list(tmp_path.glob("*.tmp"))
+    
+    def test_hash_pool_shared_across_messages(self, tmp_path: Path):
+        """Test one hashing pool serves every message and is shut down on close."""
+        with ExporterFactory.create_exporter(ExportConfig(output_dir=tmp_path), "attachments") as exporter:
+            self._save_all(exporter, [FakeAttachment("a.txt", b"a")], tmp_path)
+            pool = exporter._hash_pool
+            self._save_all(exporter, [FakeAttachment("b.txt", b"b")], tmp_path)
+            assert pool is not None
+            assert exporter._hash_pool is pool
+        
+        assert exporter._hash_pool is None
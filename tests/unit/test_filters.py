@@ -1,16 +1,17 @@
 """Unit tests for email filters."""
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
 from outlook_exporter.core.models import EmailMetadata
-from outlook_exporter.filters.base import CompositeFilter, PassThroughFilter
+from outlook_exporter.filters.base import CompositeFilter, EmailFilter, PassThroughFilter
 from outlook_exporter.filters.email_filters import (
     DateRangeFilter,
     SenderFilter,
     SubjectKeywordFilter,
     BodyKeywordFilter,
+    AttachmentPresenceFilter,
 )
 
 def create_test_email(
@@ -94,6 +95,12 @@ class TestDateRangeFilter:
         # Email after range
         too_new = create_test_email(days_offset=2)
         assert not filter.matches(too_new)
+    
+    def test_bounds_changed_after_construction(self):
+        """Test matches() uses the current bounds."""
+        filter = DateRangeFilter()
+        filter.start_date = datetime.now() - timedelta(days=1)
+        assert not filter.matches(create_test_email(days_offset=-3))
 
 class TestSenderFilter:
     """Tests for SenderFilter."""
@@ -194,6 +201,16 @@ class TestBodyKeywordFilter:
         # Only one keyword present
         email2 = create_test_email(body="Please urgent action")
         assert not filter.matches(email2)
+    
+    def test_many_keywords_with_overlaps(self):
+        """Test many keywords, including overlapping and repeated ones."""
+        filter = BodyKeywordFilter(["Invoice", "voice", "due", "DUE", "paid"])
+        
+        email1 = create_test_email(body="INVOICE due - not yet paid")
+        assert filter.matches(email1)
+        
+        email2 = create_test_email(body="Invoice due")
+        assert not filter.matches(email2)
 
 class TestCompositeFilter:
     """Tests for CompositeFilter."""
@@ -243,3 +260,81 @@ class TestCompositeFilter:
             subject="Monthly Report"
         )
         assert not composite.matches(email)
+    
+    def test_cheapest_filters_run_first(self):
+        """Test sub-filters are reordered by cost and evaluation short-circuits."""
+        calls = []
+        
+        class CountingFilter(EmailFilter):
+            def matches(self, email):
+                calls.append(email)
+                return True
+        
+        counting_filter = CountingFilter()
+        body_filter = BodyKeywordFilter(["invoice"])
+        sender_filter = SenderFilter(["sender@example.com"])
+        date_filter = DateRangeFilter(start_date=datetime.now() - timedelta(days=7))
+        
+        composite = CompositeFilter([counting_filter, body_filter, sender_filter, date_filter])
+        assert composite.filters == [date_filter, sender_filter, body_filter, counting_filter]
+        
+        assert not composite.matches(create_test_email(sender="other@example.com"))
+        assert calls == []
+        
+        email = create_test_email(sender="sender@example.com", body="Invoice attached")
+        assert composite.matches(email)
+        assert calls == [email]
+    
+    def test_nested_composite_and_automaton(self):
+        """Test generated predicates for nested composites and many keywords."""
+        inner = CompositeFilter([SubjectKeywordFilter(["q1", "report", "final"])])
+        composite = CompositeFilter([inner, AttachmentPresenceFilter(True), PassThroughFilter()])
+        
+        assert composite.matches(create_test_email(subject="Final Q1 Report"))
+        assert not composite.matches(create_test_email(subject="Q1 Report draft"))
+    
+    def test_date_range_in_composite(self):
+        """Test a bounded date range compiles into the composite predicate."""
+        composite = CompositeFilter([DateRangeFilter(
+            start_date=datetime.now() - timedelta(days=7),
+            end_date=datetime.now() - timedelta(days=1),
+        )])
+        assert composite.matches(create_test_email(days_offset=-3))
+        assert not composite.matches(create_test_email(days_offset=-10))
+        assert not composite.matches(create_test_email(days_offset=0))
+    
+    def test_needs_body(self):
+        """Test the composite reports whether any sub-filter reads the body."""
+        assert not CompositeFilter([]).needs_body
+        assert not CompositeFilter([SenderFilter(["a@b.c"]), SubjectKeywordFilter(["x"])]).needs_body
+        assert CompositeFilter([SenderFilter(["a@b.c"]), BodyKeywordFilter(["x"])]).needs_body
+
+class TestDaslTranslation:
+    """Tests for pushing filters down to Items.Restrict."""
+    
+    def test_keyword_filters_stay_in_python(self):
+        """Test filters without a DASL form produce no restriction."""
+        assert SubjectKeywordFilter(["x"]).to_dasl() is None
+        assert CompositeFilter([BodyKeywordFilter(["x"]), PassThroughFilter()]).to_dasl() is None
+    
+    def test_date_range_is_inclusive(self):
+        """Test date bounds are widened to whole minutes."""
+        start = datetime(2024, 1, 1, 8, 30, 45).astimezone()
+        end = datetime(2024, 1, 31, 17, 0, 10).astimezone()
+        query = DateRangeFilter(start, end).to_dasl()
+        assert query.count('"urn:schemas:httpmail:datereceived"') == 2
+        assert start.replace(second=0).astimezone(UTC).strftime("'%Y-%m-%d %H:%M'") in query
+        assert (end.replace(second=0) + timedelta(minutes=1)).astimezone(UTC).strftime("'%Y-%m-%d %H:%M'") in query
+    
+    def test_composite_combines_clauses(self):
+        """Test sender, attachment and keyword filters combine into one query."""
+        composite = CompositeFilter([
+            SubjectKeywordFilter(["invoice"]),
+            SenderFilter(["A@example.com", "o'brien@example.com"]),
+            AttachmentPresenceFilter(True),
+        ])
+        query = composite.to_dasl()
+        assert "= 'a@example.com' OR " in query
+        assert "= 'o''brien@example.com'" in query
+        assert query.endswith('("urn:schemas:httpmail:hasattachment" = 1)')
+        assert query.count(") AND (") == 1
@@ -74,7 +74,7 @@ def test_export_config_defaults():
     
     assert not config.include_inline
     assert config.duplicates_subfolder == "duplicates"
-    assert config.hash_algorithm == "sha256"
+    assert config.hash_algorithm == "blake2b"
     assert not config.dry_run
     assert config.subject_sanitize_length == 80
     assert config.batch_size == 200
@@ -112,3 +112,34 @@ def test_export_result_add_error():
     assert len(result.errors) == 2
     assert "Error 1" in result.errors
     assert "Error 2" in result.errors
+
+def test_email_metadata_lowercase_caches():
+    """Test lowercased fields are derived lazily and excluded from equality."""
+    now = datetime.now()
+    email = EmailMetadata(
+        subject="Mixed CASE",
+        sender_email="Sender@Example.com",
+        sender_name="Sender",
+        received_time=now,
+        sent_time=None,
+        to_recipients="",
+        cc_recipients="",
+        body="Body TEXT",
+        html_body=""
+    )
+    
+    assert email.subject_lower == "mixed case"
+    assert email.body_lower == "body text"
+    assert email.sender_email_lower == "sender@example.com"
+    assert email == EmailMetadata("Mixed CASE", "Sender@Example.com", "Sender", now, None, "", "", "Body TEXT", "")
+
+def test_email_metadata_set_body():
+    """Test set_body marks the body loaded and refreshes the lowercase cache."""
+    email = EmailMetadata("Subject", "a@example.com", "A", datetime.now(), None, "", "", "", "", body_loaded=False)
+    assert email.body_lower == ""
+    
+    email.set_body("Loaded BODY", "<p>Loaded BODY</p>")
+    
+    assert email.body_loaded
+    assert email.html_body == "<p>Loaded BODY</p>"
+    assert email.body_lower == "loaded body"
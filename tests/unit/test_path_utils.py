@@ -7,6 +7,7 @@ from outlook_exporter.storage.path_utils import (
     sanitize_for_filesystem,
     create_email_folder_path,
     ensure_unique_path,
+    UniquePathAllocator,
     format_file_size,
 )
 
@@ -150,6 +151,25 @@ class TestEnsureUniquePath:
         result = ensure_unique_path(base)
         assert result == tmp_path / "test_3.txt"
 
+class TestUniquePathAllocator:
+    """Tests for UniquePathAllocator."""
+    
+    def test_allocations_are_reserved(self, tmp_path):
+        """Test existing files and earlier allocations are both avoided."""
+        (tmp_path / "test.txt").write_text("content")
+        allocator = UniquePathAllocator()
+        
+        assert allocator.allocate(tmp_path / "test.txt") == tmp_path / "test_1.txt"
+        assert allocator.allocate(tmp_path / "test.txt") == tmp_path / "test_2.txt"
+        assert allocator.allocate(tmp_path / "other.txt") == tmp_path / "other.txt"
+        assert allocator.allocate(tmp_path / "other.txt") == tmp_path / "other_1.txt"
+    
+    def test_missing_directory(self, tmp_path):
+        """Test allocating in a directory that does not exist yet."""
+        allocator = UniquePathAllocator()
+        target = tmp_path / "new" / "file.bin"
+        assert allocator.allocate(target) == target
+
 class TestFormatFileSize:
     """Tests for format_file_size function."""
     
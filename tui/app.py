@@ -158,11 +158,12 @@ class OutlookExportTUI(App):
                 folder=None,
                 limit=None,
                 batch_size=200,
+                workers=4,
                 dry_run=dry_run,
                 open_folder=False,
                 log_file=None,
                 duplicates_subfolder="duplicates",
-                hash_algorithm="sha256",
+                hash_algorithm="blake2b",
                 include_inline=self.query_one("#include-inline", Checkbox).value,
                 export_mail=export_mail,
                 export_markdown=export_markdown,